@@ -1,15 +1,27 @@
+import asyncio
 import logging
 import html
 import hashlib
+import os
+from contextlib import nullcontext
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from nicegui import ui
-from src.services.image_service import ImageGenerationError
+from typing import Callable, Optional
+from nicegui import Client, background_tasks, context, ui
+from src.services.image_service import (
+    ImageGenerationError,
+    ImageService,
+    THUMBNAIL_SUFFIX,
+    thumbnail_path_for,
+)
 from src.app import APP
 
 logger = logging.getLogger(__name__)
 
+# Number of image cards rendered per "Show more" step in selection grids.
+GRID_PAGE_SIZE = 60
+
 
 def notify_error(message: str, exception: Optional[Exception] = None) -> None:
     """Show an error dialog with details."""
@@ -60,15 +72,50 @@ def _format_since(iso: Optional[str]) -> str:
         return iso
 
 
-def usage_text() -> tuple[str, str, Optional[str], bool]:
-    """Return (tokens_text, since_text, cost_text, has_cost)."""
-    if APP.settings is None:
-        return ("Tokens: —", "Since: —", None, False)
+def debounce(callback: Callable[[], None], delay: float = 0.25) -> Callable[[], None]:
+    """Wrap ``callback`` so bursts of calls run it once, ``delay`` seconds later.
+
+    Each call cancels the pending run and schedules a new one. The deferred
+    run happens outside NiceGUI's event handling, so it re-enters the calling
+    client's context and reports errors to that client itself.
+    """
+    pending: list[Optional[asyncio.TimerHandle]] = [None]
+
+    def run(client: Optional[Client]) -> None:
+        with client or nullcontext():
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Deferred update failed: {e}")
+                if client is not None:
+                    ui.notify(str(e), type="negative")
+
+    def wrapper() -> None:
+        try:
+            client = context.client
+        except RuntimeError:
+            client = None  # Not called from a page, e.g. in tests
+        if pending[0] is not None:
+            pending[0].cancel()
+        pending[0] = asyncio.get_running_loop().call_later(delay, run, client)
+
+    return wrapper
 
-    usage = APP.settings.get_gemini_usage()
+
+def usage_snapshot() -> tuple[str, str, Optional[str], bool, str]:
+    """Return (tokens_text, since_text, cost_text, has_cost, tooltip_text).
+
+    The usage counters are read once and shared by the header labels and the
+    tooltip.
+    """
+    usage = APP.settings.get_gemini_usage() if APP.settings else None
     if not isinstance(usage, dict):
-        return ("Tokens: —", "Since: —", None, False)
+        return ("Tokens: —", "Since: —", None, False, "Gemini usage is unavailable.")
+    return (*_usage_text(usage), _usage_tooltip_text(usage))
 
+
+def _usage_text(usage: dict) -> tuple[str, str, Optional[str], bool]:
+    """Return (tokens_text, since_text, cost_text, has_cost)."""
     totals = usage.get("totals") if isinstance(usage.get("totals"), dict) else {}
     total_tokens = int(totals.get("total_tokens", 0) or 0)
     tokens_text = f"Tokens: {total_tokens}"
@@ -79,14 +126,7 @@ def usage_text() -> tuple[str, str, Optional[str], bool]:
     return (tokens_text, since_text, f"Cost: {cost}", True)
 
 
-def usage_tooltip_text() -> str:
-    if APP.settings is None:
-        return "Gemini usage is unavailable."
-
-    usage = APP.settings.get_gemini_usage()
-    if not isinstance(usage, dict):
-        return "Gemini usage is unavailable."
-
+def _usage_tooltip_text(usage: dict) -> str:
     models = usage.get("models")
     if not isinstance(models, dict) or not models:
         totals = usage.get("totals") if isinstance(usage.get("totals"), dict) else {}
@@ -116,8 +156,13 @@ def usage_tooltip_text() -> str:
     return "\n".join(lines).strip() or "Gemini usage is unavailable."
 
 
+@lru_cache(maxsize=16)
 def tooltip_html_from_text(text: str) -> str:
-    """Render tooltip text with reliable line breaks using HTML."""
+    """Render tooltip text with reliable line breaks using HTML.
+
+    Cached, so every connected client's header shares one rendering of the
+    same usage text.
+    """
     escaped = html.escape(text or "")
     rendered_lines: list[str] = []
     for line in escaped.split("\n"):
@@ -131,22 +176,26 @@ def get_folder_hash(folder_path: Path) -> str:
     if not folder_path.exists():
         return ""
 
-    files = sorted([f.name for f in folder_path.iterdir() if f.is_file()])
+    # DirEntry.is_file() reuses the directory listing instead of a stat per file
+    with os.scandir(folder_path) as entries:
+        files = sorted(entry.name for entry in entries if entry.is_file())
     hasher = hashlib.md5()
     for filename in files:
         hasher.update(filename.encode("utf-8"))
     return hasher.hexdigest()
 
 
+# Image folders polled by the folder watcher.
+WATCHED_FOLDERS = ["inputs", "references", "pages"]
+
+
 def get_folder_state() -> dict:
     """Get current state of monitored folders using hashes."""
     state = {}
     if not APP.settings or not APP.settings.working_folder:
         return state
 
-    folders_to_watch = ["inputs", "references", "pages"]
-
-    for folder_name in folders_to_watch:
+    for folder_name in WATCHED_FOLDERS:
         folder = APP.settings.get_subfolder(folder_name)
         if folder:
             state[folder_name] = get_folder_hash(folder)
@@ -156,6 +205,105 @@ def get_folder_state() -> dict:
     return state
 
 
+def refresh_thumbnail_index() -> None:
+    """Rebuild the set of known thumbnail filenames with a single directory scan."""
+    thumbnails = APP.settings.get_subfolder("thumbnails") if APP.settings else None
+    if not thumbnails:
+        APP.thumbnail_index = set()
+        return
+
+    try:
+        with os.scandir(thumbnails) as entries:
+            APP.thumbnail_index = {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        APP.thumbnail_index = set()
+
+
+# Image elements shown empty until prepare_thumbnails has created the
+# thumbnail for their image, keyed by image path.
+_thumbnail_waiters: dict[Path, list[ui.image]] = {}
+
+
+def prepare_thumbnails(image_paths: list[Path]) -> None:
+    """Start creating missing thumbnails for a batch of images in parallel.
+
+    The batch runs in the background, so the grid is built right away; cards
+    built meanwhile get a placeholder from ``thumbnail_image``.
+    """
+    if not APP.image_service:
+        return
+
+    missing = [
+        p
+        for p in image_paths
+        if f"{p.stem}{THUMBNAIL_SUFFIX}" not in APP.thumbnail_index
+        and p not in _thumbnail_waiters
+    ]
+    if not missing:
+        return
+
+    for path in missing:
+        _thumbnail_waiters[path] = []
+    background_tasks.create(_create_thumbnails(APP.image_service, missing))
+
+
+async def _create_thumbnails(
+    image_service: ImageService, image_paths: list[Path]
+) -> None:
+    """Create thumbnails without blocking the event loop and show them."""
+    try:
+        thumbnails = await image_service.ensure_thumbnails(image_paths)
+    except Exception as e:
+        logger.warning(f"Failed to prepare thumbnails: {e}")
+        thumbnails = {}
+    APP.thumbnail_index.update(thumb.name for thumb in thumbnails.values())
+
+    for path in image_paths:
+        # Without a thumbnail, show the full image as before.
+        source = str(thumbnails.get(path, path))
+        for image in _thumbnail_waiters.pop(path, []):
+            image.set_source(source)
+
+
+def thumbnail_image(image_path: Path, display_path: Path) -> ui.image:
+    """Create the image element for a card showing ``display_path``.
+
+    While ``prepare_thumbnails`` is still creating the thumbnail for
+    ``image_path`` the element starts empty and gets its source once the
+    thumbnail is ready.
+    """
+    waiters = _thumbnail_waiters.get(image_path)
+    if waiters is None or display_path != image_path:
+        return ui.image(str(display_path))
+
+    image = ui.image()
+    waiters.append(image)
+    return image
+
+
+def get_display_path(image_path: Path) -> Optional[Path]:
+    """Return the path to show on an image card.
+
+    Known thumbnails are looked up in ``APP.thumbnail_index`` instead of probing
+    the filesystem. An image whose thumbnail ``prepare_thumbnails`` is still
+    creating is returned itself; other missing thumbnails are created through
+    the image service. Falls back to the full image, or None if neither exists.
+    """
+    thumb_name = f"{image_path.stem}{THUMBNAIL_SUFFIX}"
+    if APP.settings and thumb_name in APP.thumbnail_index:
+        return thumbnail_path_for(APP.settings.working_folder, image_path)
+
+    if APP.image_service and image_path not in _thumbnail_waiters:
+        try:
+            thumb_path = APP.image_service.ensure_thumbnail(image_path)
+            APP.thumbnail_index.add(thumb_path.name)
+            return thumb_path
+        except Exception as e:
+            logger.warning(f"Failed to ensure thumbnail for {image_path}: {e}")
+
+    return image_path if image_path.exists() else None
+
+
 def check_folder_changes() -> None:
     """Check for folder changes and refresh UI if needed."""
     current_state = get_folder_state()
@@ -164,6 +312,7 @@ def check_folder_changes() -> None:
         logger.info("Folder changes detected, refreshing...")
 
         APP.last_folder_state = current_state
+        refresh_thumbnail_index()
 
         APP.trigger_refresh()
 
@@ -175,11 +324,13 @@ def update_folder_state() -> None:
     so the folder watcher doesn't trigger a second refresh when it detects the change.
     """
     APP.last_folder_state = get_folder_state()
+    refresh_thumbnail_index()
 
 
 def start_folder_watcher() -> None:
     """Start the folder watcher timer."""
     APP.last_folder_state = get_folder_state()
+    refresh_thumbnail_index()
 
     # Always restart the timer to ensure it's bound to the current client/page
     if APP.folder_watcher_timer:
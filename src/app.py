@@ -1,4 +1,5 @@
 import logging
+import weakref
 from pathlib import Path
 from typing import Optional, Any, Callable
 from nicegui import ui, app
@@ -22,8 +23,15 @@ class BuchJaApp:
         self.status_footer: Optional[StatusFooter] = None
         self.folder_watcher_timer: Optional[Any] = None
         self.last_folder_state: dict[str, set[str]] = {}
+        self.thumbnail_index: set[str] = set()
         self.log_file: Optional[Path] = None
         self.refresh_callbacks: list[Callable[[], None]] = []
+        self.usage_callbacks: list[Callable[[], None]] = []
+        # Per browser client, so one client's page load cannot drop another's
+        # pending builds; entries go away with their client.
+        self.deferred_tab_builds: weakref.WeakKeyDictionary[
+            Any, dict[str, list[Callable[[], None]]]
+        ] = weakref.WeakKeyDictionary()
         self.check_settings_dirty: Optional[Callable[[], bool]] = None
 
         # Session state for tabs (preserved when switching)
@@ -33,6 +41,7 @@ class BuchJaApp:
             "generate_prompt": "",
             "selected_characters": {},
             "selected_references": {},
+            "selected_paths": {},
             "selected_rework_image": None,
             "sketch_data_url": None,
             "crop_source_image": None,
@@ -53,6 +62,33 @@ class BuchJaApp:
             # Might be called outside of context (e.g. tests), ignore
             pass
 
+    def register_usage_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback to be called when Gemini usage changes."""
+        self.usage_callbacks.append(callback)
+
+        try:
+            # Remove callback when client disconnects
+            def remove():
+                if callback in self.usage_callbacks:
+                    self.usage_callbacks.remove(callback)
+
+            ui.context.client.on_disconnect(remove)
+        except Exception:
+            # Might be called outside of context (e.g. tests), ignore
+            pass
+
+    def notify_usage_changed(self) -> None:
+        """Trigger all registered usage callbacks.
+
+        Usage is recorded from the image service's worker threads, so
+        callbacks must hand any UI work back to the event loop themselves.
+        """
+        for callback in list(self.usage_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in usage callback: {e}")
+
     def trigger_refresh(self) -> None:
         """Trigger all registered refresh callbacks."""
         for callback in self.refresh_callbacks:
@@ -61,6 +97,23 @@ class BuchJaApp:
             except Exception as e:
                 logger.error(f"Error in refresh callback: {e}")
 
+    def defer_until_tab_shown(self, tab_name: str, build: Callable[[], None]) -> None:
+        """Register an expensive build step to run the first time a tab is shown.
+
+        The step is kept for the current client only.
+        """
+        builds = self.deferred_tab_builds.setdefault(ui.context.client, {})
+        builds.setdefault(tab_name, []).append(build)
+
+    def run_deferred_tab_builds(self, tab_name: str) -> None:
+        """Run the current client's deferred build steps for a tab (only once)."""
+        builds = self.deferred_tab_builds.get(ui.context.client, {})
+        for build in builds.pop(tab_name, []):
+            try:
+                build()
+            except Exception as e:
+                logger.error(f"Error building {tab_name} tab: {e}")
+
     def ensure_logging(self) -> None:
         """Configure stdout + file logging.
 
@@ -115,6 +168,7 @@ def init_image_service():
                     thoughts_tokens=getattr(usage, "thoughts_tokens", None),
                     cost=getattr(usage, "cost", None),
                 )
+                APP.notify_usage_changed()
 
             system_prompt_overrides = APP.settings.get_all_system_prompt_overrides()
             APP.image_service = ImageService(
@@ -122,7 +176,10 @@ def init_image_service():
                 working_folder,
                 usage_callback=record_usage,
                 system_prompt_overrides=system_prompt_overrides,
+                max_concurrent_requests=APP.settings.max_concurrent_generations,
+                reuse_identical_results=APP.settings.reuse_identical_generations,
             )
+            APP.image_service.remove_legacy_thumbnails()
             APP.project_manager = ProjectManager(working_folder)
             logger.info("Image service initialized")
             return True
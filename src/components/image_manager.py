@@ -16,7 +16,9 @@ import subprocess
 from pathlib import Path
 from typing import Callable, Optional
 
-from nicegui import ui
+from nicegui import background_tasks, ui
+
+from src.services.image_service import thumbnail_path_for
 
 logger = logging.getLogger(__name__)
 
@@ -43,13 +45,12 @@ class ProjectManager:
         """No-op as we now read directly from filesystem."""
         pass
 
-    def get_images(self, category: str) -> list[dict]:
-        """Get all images in a category from filesystem."""
+    def _list_image_files(self, category: str) -> list[Path]:
+        """List image files in a category folder, sorted by filename."""
         folder = self._working_folder / category
         if not folder.exists():
             return []
 
-        images = []
         extensions = {".png", ".jpg", ".jpeg", ".webp"}
 
         try:
@@ -63,8 +64,16 @@ class ProjectManager:
 
         # Sort files. For pages, we rely on filename order.
         files.sort(key=lambda f: f.name)
+        return files
 
-        for i, f in enumerate(files):
+    def get_images(self, category: str) -> list[dict]:
+        """Get all images in a category from filesystem.
+
+        The ``id`` is the forward-slash path relative to the working folder,
+        while ``path`` is the absolute file path so callers can use it directly.
+        """
+        images = []
+        for i, f in enumerate(self._list_image_files(category)):
             rel_path = f.relative_to(self._working_folder)
             # Use forward slashes for consistency
             rel_path_str = str(rel_path).replace("\\", "/")
@@ -78,7 +87,7 @@ class ProjectManager:
             images.append(
                 {
                     "id": rel_path_str,
-                    "path": rel_path_str,
+                    "path": str(f),
                     "category": category,
                     "name": name,
                     "order": i + 1 if category == "pages" else 0,
@@ -90,6 +99,10 @@ class ProjectManager:
         """Get pages sorted by order (filename)."""
         return self.get_images("pages")
 
+    def get_ordered_page_paths(self) -> list[Path]:
+        """Get absolute page file paths in order, without building page dicts."""
+        return self._list_image_files("pages")
+
     def get_all_images(self) -> dict:
         """Get all images organized by category."""
         return {
@@ -134,7 +147,7 @@ class ProjectManager:
 
         return {
             "id": rel_path_str,
-            "path": rel_path_str,
+            "path": str(target_path),
             "category": category,
             "name": target_path.stem,
             "order": 0,
@@ -146,9 +159,7 @@ class ProjectManager:
             file_path = self._working_folder / image_id
             if file_path.exists():
                 # Delete thumbnail first
-                thumb_path = (
-                    self._working_folder / ".thumbnails" / f"{file_path.stem}_thumb.png"
-                )
+                thumb_path = thumbnail_path_for(self._working_folder, file_path)
                 if thumb_path.exists():
                     thumb_path.unlink()
 
@@ -200,15 +211,9 @@ class ProjectManager:
             shutil.move(str(source_path), str(target_path))
 
             # Move/Rename thumbnail
-            src_thumb = (
-                self._working_folder / ".thumbnails" / f"{source_path.stem}_thumb.png"
-            )
+            src_thumb = thumbnail_path_for(self._working_folder, source_path)
             if src_thumb.exists():
-                dst_thumb = (
-                    self._working_folder
-                    / ".thumbnails"
-                    / f"{target_path.stem}_thumb.png"
-                )
+                dst_thumb = thumbnail_path_for(self._working_folder, target_path)
                 shutil.move(str(src_thumb), str(dst_thumb))
 
             logger.info(f"Moved image {image_id} to {new_category}")
@@ -292,11 +297,9 @@ class ProjectManager:
     def _rename_file_and_thumb(self, src: Path, dst: Path):
         try:
             # Rename thumbnail first (using src stem)
-            src_thumb = self._working_folder / ".thumbnails" / f"{src.stem}_thumb.png"
+            src_thumb = thumbnail_path_for(self._working_folder, src)
             if src_thumb.exists():
-                dst_thumb = (
-                    self._working_folder / ".thumbnails" / f"{dst.stem}_thumb.png"
-                )
+                dst_thumb = thumbnail_path_for(self._working_folder, dst)
                 src_thumb.rename(dst_thumb)
 
             src.rename(dst)
@@ -331,6 +334,8 @@ class ImageManager:
         self._selected_ids: set[str] = set()
         self._container = None
         self._current_tab = initial_tab
+        # Card images waiting for a thumbnail from _prepare_thumbnails
+        self._thumbnail_waiters: dict[Path, list[ui.image]] = {}
 
         # Preview dialog state
         self._preview_dialog = None
@@ -359,13 +364,49 @@ class ImageManager:
             except Exception as e:
                 logger.warning(f"Failed to ensure thumbnail for {path}: {e}")
 
-        thumb_path = self._working_folder / ".thumbnails" / f"{path.stem}_thumb.png"
+        thumb_path = thumbnail_path_for(self._working_folder, path)
 
         # Return thumbnail if exists, otherwise original
         if thumb_path.exists():
             return thumb_path
         return path
 
+    def _prepare_thumbnails(self, images: list[dict]) -> None:
+        """Start creating missing thumbnails for a grid in parallel.
+
+        The batch runs in the background; cards built meanwhile show an empty
+        image that gets its thumbnail once the batch is done.
+        """
+        if not self._image_service:
+            return
+
+        missing = [
+            path
+            for path in (Path(img["path"]) for img in images)
+            if path not in self._thumbnail_waiters
+            and not thumbnail_path_for(self._working_folder, path).exists()
+        ]
+        if not missing:
+            return
+
+        for path in missing:
+            self._thumbnail_waiters[path] = []
+        background_tasks.create(self._create_thumbnails(missing))
+
+    async def _create_thumbnails(self, image_paths: list[Path]) -> None:
+        """Create thumbnails without blocking the event loop and show them."""
+        try:
+            thumbnails = await self._image_service.ensure_thumbnails(image_paths)
+        except Exception as e:
+            logger.warning(f"Failed to prepare thumbnails: {e}")
+            thumbnails = {}
+
+        for path in image_paths:
+            # Without a thumbnail, show the full image instead.
+            source = str(thumbnails.get(path, path))
+            for image in self._thumbnail_waiters.pop(path, []):
+                image.set_source(source)
+
     def _open_folder(self, category: str) -> None:
         """Open the category folder in the system file explorer."""
         folder = self._working_folder / category
@@ -386,11 +427,12 @@ class ImageManager:
     def _build_ui(self) -> None:
         """Build the image manager UI."""
         # Category tabs
-        with (
-            ui.tabs(value=self._current_tab)
-            .classes("w-full")
-            .bind_value(self, "_current_tab") as tabs
-        ):
+        # Track the tab via its change event; a bind_value to a plain
+        # attribute would be polled by NiceGUI's binding refresh loop.
+        with ui.tabs(
+            value=self._current_tab,
+            on_change=lambda e: setattr(self, "_current_tab", e.value),
+        ).classes("w-full") as tabs:
             ui.tab("Pages")
             ui.tab("References")
             ui.tab("Inputs")
@@ -433,6 +475,8 @@ class ImageManager:
             )
             return
 
+        self._prepare_thumbnails(pages)
+
         # Build sortable grid
         with ui.element("div").classes("grid grid-cols-4 gap-4"):
             for i, page in enumerate(pages):
@@ -446,6 +490,8 @@ class ImageManager:
             ui.label(f"No {category} yet.").classes("text-gray-500")
             return
 
+        self._prepare_thumbnails(images)
+
         with ui.element("div").classes("grid grid-cols-4 gap-4"):
             for img in images:
                 self._build_image_card(img, category)
@@ -484,16 +530,18 @@ class ImageManager:
         image_path = image_data["path"]
         image_name = image_data.get("name", Path(image_path).stem)
 
-        thumb_path = (
-            self._working_folder / ".thumbnails" / f"{Path(image_path).stem}_thumb.png"
-        )
+        thumb_path = thumbnail_path_for(self._working_folder, Path(image_path))
 
         with ui.card().classes("cursor-pointer hover:shadow-lg transition-shadow"):
             # Thumbnail with letterboxing (gray background, image fully visible)
             with ui.element("div").classes(
                 "w-full h-32 bg-gray-100 flex items-center justify-center"
             ):
-                if thumb_path.exists():
+                waiters = self._thumbnail_waiters.get(Path(image_path))
+                if waiters is not None:
+                    image = ui.image("").props("fit=contain").classes("w-full h-full")
+                    waiters.append(image)
+                elif thumb_path.exists():
                     ui.image(str(thumb_path)).props("fit=contain").classes(
                         "w-full h-full"
                     )
@@ -2,25 +2,19 @@
 
 import logging
 import asyncio
+import hashlib
 import socket
-from nicegui import ui
+from typing import Callable
+from nicegui import app, ui
 from pathlib import Path
 from src.app import APP, init_services, init_image_service
 from src._utils import (
+    debounce,
     start_folder_watcher,
-    usage_text,
-    usage_tooltip_text,
+    usage_snapshot,
     tooltip_html_from_text,
 )
 from src.components.status_footer import StatusFooter
-from src.tabs.settings import build_settings_tab
-from src.tabs.add import build_add_tab
-from src.tabs.crop import build_crop_tab
-from src.tabs.generate import build_generate_tab
-from src.tabs.sketch import build_sketch_tab
-from src.tabs.instructions import build_instructions_tab
-from src.tabs.manage import build_manage_tab
-from src.tabs.export import build_export_tab
 
 logger = logging.getLogger(__name__)
 
@@ -29,32 +23,63 @@ logo_path = Path(__file__).parent / "materials" / "logo.png"
 if not logo_path.exists():
     raise FileNotFoundError(f"Icon file not found: {logo_path}")
 
+# Custom styles are served as a static file so the browser can cache them.
+# The URL carries a content hash, so the file can be cached for a year and
+# still be refetched as soon as it changes. NiceGUI gzips responses.
+styles_path = Path(__file__).parent / "materials" / "styles.css"
+styles_version = hashlib.md5(styles_path.read_bytes()).hexdigest()[:8]
+app.add_static_file(
+    local_file=styles_path, url_path="/static/styles.css", max_cache_age=31536000
+)
+STYLESHEET_LINK = (
+    f'<link rel="stylesheet" href="/static/styles.css?v={styles_version}">'
+)
+
+# Navigation tabs in display order: (label, icon, name)
+TABS = [
+    ("Instructions", "help", "instructions"),
+    ("Settings", "settings", "settings"),
+    ("Add", "add_photo_alternate", "add"),
+    ("Crop", "crop", "crop"),
+    ("Sketch", "brush", "sketch"),
+    ("Generate", "auto_awesome", "generate"),
+    ("Manage", "folder", "manage"),
+    ("Export", "picture_as_pdf", "export"),
+]
+
+
+def _tab_builders() -> dict[str, Callable[[], None]]:
+    """Import the tab modules and return their builders keyed by tab name.
+
+    Imported here rather than at module level so the server starts without
+    them. The imports stay static so PyInstaller still finds the modules.
+    """
+    from src.tabs.instructions import build_instructions_tab
+    from src.tabs.settings import build_settings_tab
+    from src.tabs.add import build_add_tab
+    from src.tabs.crop import build_crop_tab
+    from src.tabs.sketch import build_sketch_tab
+    from src.tabs.generate import build_generate_tab
+    from src.tabs.manage import build_manage_tab
+    from src.tabs.export import build_export_tab
+
+    return {
+        "instructions": build_instructions_tab,
+        "settings": build_settings_tab,
+        "add": build_add_tab,
+        "crop": build_crop_tab,
+        "sketch": build_sketch_tab,
+        "generate": build_generate_tab,
+        "manage": build_manage_tab,
+        "export": build_export_tab,
+    }
+
 
 @ui.page("/")
 def main_page():
     """Main application page with vertical tab navigation."""
     # Add custom styles
-    ui.add_head_html("""
-        <style>
-            .q-uploader__file {
-                background-size: contain !important;
-                background-repeat: no-repeat !important;
-                background-position: center !important;
-                background-color: #f3f4f6 !important;
-            }
-            .q-uploader__file-img {
-                background-size: contain !important;
-                background-repeat: no-repeat !important;
-                background-position: center !important;
-                background-color: #f3f4f6 !important;
-            }
-            /* Vertical tabs styling */
-            .vertical-tabs .q-tabs--vertical .q-tab {
-                justify-content: center;
-                padding: 12px 16px;
-            }
-        </style>
-    """)
+    ui.add_head_html(STYLESHEET_LINK)
 
     # Initialize services
     init_services()
@@ -72,7 +97,9 @@ def main_page():
         ui.space()
 
         with ui.row().classes("items-center gap-4"):
-            tokens_text, since_text, cost_text, has_cost = usage_text()
+            tokens_text, since_text, cost_text, has_cost, tooltip_text = (
+                usage_snapshot()
+            )
             total_only = tokens_text
 
             usage_tokens_label = ui.label(total_only).classes("text-white")
@@ -80,7 +107,7 @@ def main_page():
             with usage_tokens_label:
                 with ui.tooltip():
                     usage_tooltip_html = ui.html(
-                        tooltip_html_from_text(usage_tooltip_text()),
+                        tooltip_html_from_text(tooltip_text),
                         sanitize=False,
                     )
 
@@ -93,21 +120,29 @@ def main_page():
             usage_cost_label._props["marker"] = "gemini-usage-cost"
             usage_cost_label.set_visibility(has_cost)
 
+            last_usage = [(tokens_text, since_text, cost_text, has_cost)]
+            last_tooltip_text = [tooltip_text]
+
             def refresh_usage_labels() -> None:
-                t, s, c, has = usage_text()
-                usage_tokens_label.text = t
-                usage_tooltip_html.content = tooltip_html_from_text(
-                    usage_tooltip_text()
-                )
-                usage_since_label.text = s
-                usage_cost_label.text = c or ""
-                usage_cost_label.set_visibility(has)
+                # Only touch what changed since the last refresh
+                t, s, c, has, text = usage_snapshot()
+                if (t, s, c, has) != last_usage[0]:
+                    last_usage[0] = (t, s, c, has)
+                    usage_tokens_label.text = t
+                    usage_since_label.text = s
+                    usage_cost_label.text = c or ""
+                    usage_cost_label.set_visibility(has)
+
+                # The HTML is only rebuilt when its source text differs
+                if text != last_tooltip_text[0]:
+                    last_tooltip_text[0] = text
+                    usage_tooltip_html.content = tooltip_html_from_text(text)
 
             def reset_usage() -> None:
                 if APP.settings is None:
                     return
                 APP.settings.reset_gemini_usage()
-                refresh_usage_labels()
+                APP.notify_usage_changed()
 
             reset_btn = (
                 ui.button(icon="restart_alt", on_click=reset_usage)
@@ -139,29 +174,25 @@ def main_page():
                 "flat round dense color=white"
             ).tooltip("Shutdown Application")
 
-            ui.timer(1.0, refresh_usage_labels)
+            # Labels are pushed after each recorded API call instead of polled.
+            # Usage is recorded in a worker thread, so hop back onto the loop;
+            # a burst of parallel generations then refreshes the labels once.
+            loop = asyncio.get_running_loop()
+            schedule_usage_refresh = debounce(refresh_usage_labels, delay=0.05)
+            APP.register_usage_callback(
+                lambda: loop.call_soon_threadsafe(schedule_usage_refresh)
+            )
 
     # Main content with vertical tabs
     with ui.element("div").classes("flex w-full h-full"):
         # Vertical tabs on the left
         with ui.element("div").classes("vertical-tabs"):
             with ui.tabs().props("vertical").classes("bg-gray-100 h-full") as tabs:
-                instructions_tab = ui.tab("Instructions", icon="help")
-                instructions_tab._props["marker"] = "tab-instructions"
-                settings_tab = ui.tab("Settings", icon="settings")
-                settings_tab._props["marker"] = "tab-settings"
-                add_tab = ui.tab("Add", icon="add_photo_alternate")
-                add_tab._props["marker"] = "tab-add"
-                crop_tab = ui.tab("Crop", icon="crop")
-                crop_tab._props["marker"] = "tab-crop"
-                sketch_tab = ui.tab("Sketch", icon="brush")
-                sketch_tab._props["marker"] = "tab-sketch"
-                generate_tab = ui.tab("Generate", icon="auto_awesome")
-                generate_tab._props["marker"] = "tab-generate"
-                manage_tab = ui.tab("Manage", icon="folder")
-                manage_tab._props["marker"] = "tab-manage"
-                export_tab = ui.tab("Export", icon="picture_as_pdf")
-                export_tab._props["marker"] = "tab-export"
+                tab_refs = {}
+                for label, icon, name in TABS:
+                    tab = ui.tab(label, icon=icon)
+                    tab._props["marker"] = f"tab-{name}"
+                    tab_refs[name] = tab
 
             # Handle tab changes to warn about unsaved settings
             current_tab = "Instructions"
@@ -191,51 +222,37 @@ def main_page():
                             # User confirmed leaving, allow the change
                             current_tab = new_tab
                             tabs.value = new_tab
+                            APP.run_deferred_tab_builds(new_tab)
                         return
 
                 current_tab = new_tab
+                APP.run_deferred_tab_builds(new_tab)
 
             tabs.on_value_change(on_tab_change)
 
         # Tab panels on the right (with keep-alive for state preservation)
         with (
-            ui.tab_panels(tabs, value=instructions_tab)
+            ui.tab_panels(tabs, value=tab_refs["instructions"])
             .props("keep-alive")
             .classes("flex-1 overflow-auto")
         ):
-            with ui.tab_panel(instructions_tab):
-                build_instructions_tab()
-
-            with ui.tab_panel(settings_tab):
-                build_settings_tab()
-
-            with ui.tab_panel(add_tab):
-                build_add_tab()
-
-            with ui.tab_panel(crop_tab):
-                build_crop_tab()
-
-            with ui.tab_panel(sketch_tab):
-                build_sketch_tab()
-
-            with ui.tab_panel(generate_tab):
-                build_generate_tab()
-
-            with ui.tab_panel(manage_tab):
-                build_manage_tab()
-
-            with ui.tab_panel(export_tab):
-                build_export_tab()
+            builders = _tab_builders()
+            for _, _, name in TABS:
+                with ui.tab_panel(tab_refs[name]):
+                    builders[name]()
 
     # Status footer
     APP.status_footer = StatusFooter()
 
 
 def _find_free_port() -> int:
-    """Find a free port on localhost."""
+    """Find a free port on localhost.
+
+    ui.run treats port=0 as "use the default 8080" and needs the real port
+    up front for the browser URL, so the port has to be probed here.
+    """
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(("127.0.0.1", 0))
-        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         return s.getsockname()[1]
 
 
@@ -275,6 +292,8 @@ def main():
         show=True,
         host="127.0.0.1",
         port=port,
+        # Nothing relies on polled bindings; UI updates are event-driven
+        binding_refresh_interval=1.0,
     )
 
 
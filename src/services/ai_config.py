@@ -14,9 +14,17 @@ import json
 import logging
 import os
 import sys
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Optional
 
+try:
+    # Native parser; installed with NiceGUI on most platforms
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +43,10 @@ def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+# Resolved once; Path.resolve() touches the filesystem.
+_DEFAULT_CONFIG_PATH = _repo_root() / "ai_config.json"
+
+
 def get_ai_config_path(explicit_path: Optional[Path] = None) -> Path:
     """Resolve the AI config JSON path."""
     if explicit_path is not None:
@@ -45,76 +57,109 @@ def get_ai_config_path(explicit_path: Optional[Path] = None) -> Path:
         return Path(override)
 
     # Prefer repo root for local development and tests.
-    return _repo_root() / "ai_config.json"
+    return _DEFAULT_CONFIG_PATH
+
+
+# Sections exposed as string-only mappings by get_system_prompts/get_templates.
+_STRING_SECTIONS = ("system_prompts", "templates")
+
+# Cache entry: the file's mtime it was read at, the read-only config, and its
+# string sections.
+_Entry = tuple[int, Mapping[str, Any], dict[str, Mapping[str, str]]]
+
+# Parsed configs keyed by path.
+_CACHE: dict[Path, _Entry] = {}
+
+
+def _freeze(value: Any) -> Any:
+    """Return ``value`` with its dicts and lists made read-only, recursively."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _string_section(cfg: Mapping[str, Any], section: str) -> Mapping[str, str]:
+    """Return the string values of ``cfg[section]`` as a read-only mapping."""
+    raw = cfg.get(section) if isinstance(cfg.get(section), Mapping) else {}
+    return MappingProxyType({str(k): v for k, v in raw.items() if isinstance(v, str)})
 
 
-def load_ai_config(path: Optional[Path] = None) -> dict[str, Any]:
+def _load_cached(path: Path) -> _Entry:
+    """Parse ``path`` once and reuse the cache entry until the file changes."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise AIConfigError(f"AI config file not found: {path}") from None
+
+    entry = _CACHE.get(path)
+    if entry and entry[0] == mtime_ns:
+        return entry
+
+    raw = path.read_bytes()
+    try:
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except json.JSONDecodeError as exc:  # orjson's error subclasses this one
+        raise AIConfigError(f"Invalid JSON in AI config file {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise AIConfigError(f"AI config must be a JSON object: {path}")
+
+    config = _freeze(data)
+    sections = {name: _string_section(config, name) for name in _STRING_SECTIONS}
+    entry = (mtime_ns, config, sections)
+    _CACHE[path] = entry
+    return entry
+
+
+def load_ai_config(path: Optional[Path] = None) -> Mapping[str, Any]:
     """Load AI config from JSON.
 
+    The parsed file is cached and re-read only when its mtime changes. The
+    cached config is shared by all callers, so it is returned read-only:
+    objects become mappings and arrays become tuples.
+
     Raises:
         AIConfigError: If the file does not exist or is invalid JSON.
     """
-    resolved = get_ai_config_path(path)
+    return _load_cached(get_ai_config_path(path))[1]
 
-    if not resolved.exists():
-        raise AIConfigError(f"AI config file not found: {resolved}")
 
-    try:
-        with open(resolved, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            raise AIConfigError(f"AI config must be a JSON object: {resolved}")
-        return data
-    except json.JSONDecodeError as exc:
-        raise AIConfigError(
-            f"Invalid JSON in AI config file {resolved}: {exc}"
-        ) from exc
-
-
-def get_model(name: str, *, config: Optional[dict[str, Any]] = None) -> str:
+def get_model(name: str, *, config: Optional[Mapping[str, Any]] = None) -> str:
     cfg = config or load_ai_config()
-    models = cfg.get("models") if isinstance(cfg.get("models"), dict) else {}
+    models = cfg.get("models") if isinstance(cfg.get("models"), Mapping) else {}
     value = models.get(name)
     if isinstance(value, str) and value.strip():
         return value.strip()
     raise AIConfigError(f"Model '{name}' not found in ai_config.json")
 
 
-def get_system_prompts(*, config: Optional[dict[str, Any]] = None) -> dict[str, str]:
-    cfg = config or load_ai_config()
-    prompts = (
-        cfg.get("system_prompts") if isinstance(cfg.get("system_prompts"), dict) else {}
-    )
-    result: dict[str, str] = {}
-    for key, value in prompts.items():
-        if isinstance(value, str):
-            result[str(key)] = value
-    return result
+def get_system_prompts(
+    *, config: Optional[Mapping[str, Any]] = None
+) -> Mapping[str, str]:
+    if config is None:
+        return _load_cached(get_ai_config_path())[2]["system_prompts"]
+    return _string_section(config, "system_prompts")
 
 
-def get_templates(*, config: Optional[dict[str, Any]] = None) -> dict[str, str]:
-    cfg = config or load_ai_config()
-    templates = cfg.get("templates") if isinstance(cfg.get("templates"), dict) else {}
-    result: dict[str, str] = {}
-    for key, value in templates.items():
-        if isinstance(value, str):
-            result[str(key)] = value
-    return result
+def get_templates(*, config: Optional[Mapping[str, Any]] = None) -> Mapping[str, str]:
+    if config is None:
+        return _load_cached(get_ai_config_path())[2]["templates"]
+    return _string_section(config, "templates")
 
 
 def get_supported_models_for_usage_tracking(
-    *, config: Optional[dict[str, Any]] = None
-) -> set[str]:
+    *, config: Optional[Mapping[str, Any]] = None
+) -> frozenset[str]:
     cfg = config or load_ai_config()
     raw = cfg.get("supported_models_for_usage_tracking")
     models: set[str] = set()
-    if isinstance(raw, list):
+    if isinstance(raw, (list, tuple)):
         for item in raw:
             if isinstance(item, str) and item.strip():
                 models.add(item.strip())
     if models:
-        return models
+        return frozenset(models)
 
     # Fall back to configured model if no explicit list.
-    models.add(get_model("image_generation", config=cfg))
-    return models
+    return frozenset({get_model("image_generation", config=cfg)})
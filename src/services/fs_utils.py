@@ -0,0 +1,30 @@
+"""File system helpers shared by the BuchJa services."""
+
+import os
+from pathlib import Path
+
+
+def stat_files(paths: list[Path]) -> dict[Path, os.stat_result]:
+    """Return the stat result of each of ``paths`` that is an existing file.
+
+    Paths usually share one or two folders, so each folder is listed once
+    with ``os.scandir`` instead of checking every path separately. Names are
+    compared with ``os.path.normcase``, matching ``Path.exists()`` on
+    case-insensitive file systems. Missing files are left out.
+    """
+    by_folder: dict[Path, dict[str, list[Path]]] = {}
+    for path in paths:
+        names = by_folder.setdefault(path.parent, {})
+        names.setdefault(os.path.normcase(path.name), []).append(path)
+
+    stats: dict[Path, os.stat_result] = {}
+    for folder, names in by_folder.items():
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    matches = names.get(os.path.normcase(entry.name))
+                    if matches and entry.is_file():
+                        stats.update(dict.fromkeys(matches, entry.stat()))
+        except OSError:
+            continue
+    return stats
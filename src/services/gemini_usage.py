@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from typing import Any, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GeminiUsage:
     """Usage numbers for a single Gemini API call."""
 
@@ -37,10 +37,62 @@ def _get_attr(obj: Any, name: str) -> Any:
     return getattr(obj, name, None)
 
 
+# Usage metadata fields read by extract_gemini_usage. Alternate names cover
+# UsageMetadata vs. GenerateContentResponseUsageMetadata.
+_USAGE_ATTRS = (
+    "prompt_token_count",
+    "response_token_count",
+    "candidates_token_count",
+    "total_token_count",
+    "thoughts_token_count",
+    "prompt_tokens_details",
+    "response_tokens_details",
+    "candidates_tokens_details",
+    "cost",
+)
+
+
+def _read_attrs(obj: Any, names: tuple[str, ...]) -> dict[str, Any]:
+    """Read several attributes of ``obj`` in one pass.
+
+    SDK objects (pydantic models) keep their fields in ``__dict__``, so most
+    names resolve with a dict probe. Names not stored there (slotted classes,
+    properties) fall back to getattr.
+    """
+    if obj is None:
+        return dict.fromkeys(names)
+    fields = getattr(obj, "__dict__", None) or {}
+    return {
+        name: fields[name] if name in fields else getattr(obj, name, None)
+        for name in names
+    }
+
+
+# Normalized modality per raw SDK value. The SDK only returns a handful of
+# enum members, so the table stays tiny; the cap guards against odd inputs.
+_MODALITY_KEYS: dict[Any, Optional[str]] = {}
+_MODALITY_KEYS_MAX = 32
+
+
 def _modality_key(modality: Any) -> Optional[str]:
     """Normalize a modality value from the SDK into 'text'/'image'/..."""
     if modality is None:
         return None
+    try:
+        return _MODALITY_KEYS[modality]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable; normalize without caching.
+        return _normalize_modality(modality)
+
+    key = _normalize_modality(modality)
+    if len(_MODALITY_KEYS) < _MODALITY_KEYS_MAX:
+        _MODALITY_KEYS[modality] = key
+    return key
+
+
+def _normalize_modality(modality: Any) -> Optional[str]:
     if isinstance(modality, str):
         value = modality
     else:
@@ -54,21 +106,50 @@ def _modality_key(modality: Any) -> Optional[str]:
     return None
 
 
-def _sum_tokens_details(tokens_details: Any) -> dict[str, int]:
-    """Sum a list of ModalityTokenCount-like objects into a dict."""
-    totals: dict[str, int] = {}
+def _as_int(value: Any) -> Optional[int]:
+    """Coerce a numeric-like token value to int, or None."""
+    if value is None or type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _sum_tokens_details(tokens_details: Any) -> tuple[Optional[int], Optional[int]]:
+    """Sum a list of ModalityTokenCount-like objects.
+
+    Returns:
+        Tuple of (text_tokens, image_tokens); None for a modality that did not
+        appear. Other modalities are ignored.
+    """
+    text: Optional[int] = None
+    image: Optional[int] = None
     if not tokens_details:
-        return totals
+        return text, image
     for item in tokens_details:
-        modality = _modality_key(_get_attr(item, "modality"))
-        token_count = _get_attr(item, "token_count")
-        if modality is None or token_count is None:
+        if item is None:
             continue
-        try:
-            totals[modality] = totals.get(modality, 0) + int(token_count)
-        except (TypeError, ValueError):
+        # SDK items are pydantic models with their fields in __dict__
+        fields = getattr(item, "__dict__", None) or {}
+        modality = fields.get("modality") or getattr(item, "modality", None)
+        token_count = fields.get("token_count")
+        if token_count is None:
+            token_count = getattr(item, "token_count", None)
+
+        modality = _modality_key(modality)
+        if modality is None or token_count is None:
             continue
-    return totals
+        if type(token_count) is not int:
+            try:
+                token_count = int(token_count)
+            except (TypeError, ValueError):
+                continue
+        if modality == "text":
+            text = (text or 0) + token_count
+        elif modality == "image":
+            image = (image or 0) + token_count
+    return text, image
 
 
 def extract_gemini_usage(
@@ -87,46 +168,44 @@ def extract_gemini_usage(
         # Some SDK objects might use a different field name.
         usage = _get_attr(response_or_chunk, "usageMetadata")
 
-    prompt_tokens = _get_attr(usage, "prompt_token_count")
+    # Monetary amounts are not documented as part of usage metadata for the
+    # Gemini Developer API, but we support displaying them verbatim if the SDK
+    # ever exposes such a field.
+    cost = _get_attr(response_or_chunk, "cost")
+
+    # Most streamed chunks carry no usage at all.
+    if usage is None and cost is None:
+        return GeminiUsage(model=model)
+
+    values = _read_attrs(usage, _USAGE_ATTRS)
+    prompt_tokens = values["prompt_token_count"]
 
     # SDK may use `response_token_count` (UsageMetadata) or `candidates_token_count`
     # (GenerateContentResponseUsageMetadata).
-    output_tokens = _get_attr(usage, "response_token_count")
+    output_tokens = values["response_token_count"]
     if output_tokens is None:
-        output_tokens = _get_attr(usage, "candidates_token_count")
+        output_tokens = values["candidates_token_count"]
 
-    total_tokens = _get_attr(usage, "total_token_count")
+    total_tokens = values["total_token_count"]
 
-    thoughts_tokens = _get_attr(usage, "thoughts_token_count")
+    thoughts_tokens = values["thoughts_token_count"]
 
-    prompt_details = _get_attr(usage, "prompt_tokens_details")
+    prompt_details = values["prompt_tokens_details"]
     # Output tokens details can be named differently.
-    output_details = _get_attr(usage, "response_tokens_details") or _get_attr(
-        usage, "candidates_tokens_details"
+    output_details = (
+        values["response_tokens_details"] or values["candidates_tokens_details"]
     )
-    prompt_modality_totals = _sum_tokens_details(prompt_details)
-    output_modality_totals = _sum_tokens_details(output_details)
+    prompt_text_tokens, prompt_image_tokens = _sum_tokens_details(prompt_details)
+    output_text_tokens, output_image_tokens = _sum_tokens_details(output_details)
 
-    # Monetary amounts are not documented as part of usage metadata for the
-    # Gemini Developer API, but we support displaying them verbatim if the SDK
-    # ever exposes such a field.
-    cost = _get_attr(response_or_chunk, "cost")
     if cost is None:
-        cost = _get_attr(usage, "cost")
+        cost = values["cost"]
 
     # Coerce token values to int if they are numeric-like.
-    def as_int(value: Any) -> Optional[int]:
-        if value is None:
-            return None
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return None
-
-    prompt_tokens_i = as_int(prompt_tokens)
-    output_tokens_i = as_int(output_tokens)
-    total_tokens_i = as_int(total_tokens)
-    thoughts_tokens_i = as_int(thoughts_tokens)
+    prompt_tokens_i = _as_int(prompt_tokens)
+    output_tokens_i = _as_int(output_tokens)
+    total_tokens_i = _as_int(total_tokens)
+    thoughts_tokens_i = _as_int(thoughts_tokens)
 
     # If total tokens isn't provided but prompt/output are, we can derive a total
     # without guessing any monetary amounts.
@@ -145,8 +224,10 @@ def extract_gemini_usage(
     ):
         # Still return modality/thinking if present.
         if (
-            not prompt_modality_totals
-            and not output_modality_totals
+            prompt_text_tokens is None
+            and prompt_image_tokens is None
+            and output_text_tokens is None
+            and output_image_tokens is None
             and thoughts_tokens_i is None
         ):
             return GeminiUsage(model=model)
@@ -156,10 +237,10 @@ def extract_gemini_usage(
         prompt_tokens=prompt_tokens_i,
         output_tokens=output_tokens_i,
         total_tokens=total_tokens_i,
-        prompt_text_tokens=prompt_modality_totals.get("text"),
-        prompt_image_tokens=prompt_modality_totals.get("image"),
-        output_text_tokens=output_modality_totals.get("text"),
-        output_image_tokens=output_modality_totals.get("image"),
+        prompt_text_tokens=prompt_text_tokens,
+        prompt_image_tokens=prompt_image_tokens,
+        output_text_tokens=output_text_tokens,
+        output_image_tokens=output_image_tokens,
         thoughts_tokens=thoughts_tokens_i,
         cost=cost,
     )
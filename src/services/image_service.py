@@ -5,19 +5,27 @@ Wraps the Gemini API for image generation with support for:
 - Image-to-image with reference images
 - Sketch-based generation
 - Automatic thumbnail creation
-- Single request at a time (asyncio lock)
+- Bounded number of concurrent requests (asyncio semaphore)
 """
 
 import asyncio
+import hashlib
+import io
 import logging
 import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional, Callable
 
-from PIL import Image
+from PIL import Image, ImageOps
 from google import genai
 from google.genai import types
 
+from src.services.fs_utils import stat_files
 from src.services.gemini_usage import GeminiUsage, extract_gemini_usage
 from src.services.ai_config import (
     load_ai_config,
@@ -30,8 +38,25 @@ logger = logging.getLogger(__name__)
 
 # Constants
 THUMBNAIL_SIZE = 256
+THUMBNAIL_SUFFIX = "_thumb.webp"
+LEGACY_THUMBNAIL_SUFFIX = "_thumb.png"
 MAX_PROMPT_CHARS = 8000
 MAX_REFERENCE_IMAGES = 16
+MAX_PARALLEL_READS = 5
+REFERENCE_MAX_EDGE = 1024
+RESULT_CACHE_FOLDER = ".generation_cache"
+RESULT_CACHE_MAX_ENTRIES = 50
+
+# File extensions for the image types Gemini returns; others use mimetypes.
+_MIME_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+
+# Leading magic bytes of the attachment formats Gemini accepts.
+_MIME_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
 
 _AI_CONFIG = load_ai_config()
 
@@ -44,6 +69,78 @@ IMAGE_MODEL = get_model(
 SYSTEM_PROMPTS = get_system_prompts(config=_AI_CONFIG)
 TEMPLATES = get_templates(config=_AI_CONFIG)
 
+# PIL releases the GIL while decoding and resampling, so thumbnails for a
+# batch of images can be created in parallel threads.
+_THUMBNAIL_POOL = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="thumbnail"
+)
+
+
+def _extension_for(mime_type: str) -> str:
+    """Return the file extension for a generated image's MIME type."""
+    return (
+        _MIME_EXTENSIONS.get(mime_type)
+        or mimetypes.guess_extension(mime_type)
+        or ".png"
+    )
+
+
+def _sniff_mime(header: bytes) -> str:
+    """Return the MIME type of image data from its first 12 bytes.
+
+    Unknown formats default to JPEG.
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime_type in _MIME_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    return "image/jpeg"
+
+
+def thumbnail_path_for(working_folder: Path, image_path: Path) -> Path:
+    """Return where the thumbnail for an image is stored in the working folder."""
+    return working_folder / ".thumbnails" / f"{image_path.stem}{THUMBNAIL_SUFFIX}"
+
+
+@lru_cache(maxsize=64)
+def _prepare_reference(path: str, mtime_ns: int, size: int) -> tuple[bytes, str]:
+    """Read an attachment, downscaling it if it exceeds ``REFERENCE_MAX_EDGE``.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key, so a file that
+    changed on disk is prepared again.
+
+    Returns:
+        Tuple of (data, mime_type). When the original bytes are returned
+        unchanged, mime_type is sniffed from their header.
+    """
+    data = Path(path).read_bytes()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= REFERENCE_MAX_EDGE:
+                return data, _sniff_mime(data[:12])
+
+            has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+            # Re-encoding drops the EXIF orientation tag, so apply it first
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if has_alpha else "RGB")
+            img.thumbnail((REFERENCE_MAX_EDGE, REFERENCE_MAX_EDGE), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            if has_alpha:
+                img.save(buffer, "PNG")
+                mime_type = "image/png"
+            else:
+                img.save(buffer, "JPEG", quality=90)
+                mime_type = "image/jpeg"
+    except OSError as e:
+        logger.warning(f"Could not downscale {path}, sending original: {e}")
+        return data, _sniff_mime(data[:12])
+
+    logger.info("Downscaled attachment %s to %dx%d", path, *img.size)
+    return buffer.getvalue(), mime_type
+
 
 class ImageGenerationError(Exception):
     """Raised when image generation fails."""
@@ -62,6 +159,8 @@ class ImageService:
         working_folder: Path,
         usage_callback: Optional[Callable[[GeminiUsage], None]] = None,
         system_prompt_overrides: Optional[dict[str, str]] = None,
+        max_concurrent_requests: int = 1,
+        reuse_identical_results: bool = False,
     ):
         """Initialize the image service.
 
@@ -70,13 +169,22 @@ class ImageService:
             working_folder: Base folder for storing generated images.
             usage_callback: Optional callback for usage tracking.
             system_prompt_overrides: Optional dict of system prompt key -> override text.
+            max_concurrent_requests: How many generation/rework requests may be
+                in flight at once. Further requests wait for a free slot.
+            reuse_identical_results: Serve a request identical to an earlier one
+                (same prompt, settings and attachment bytes) from the on-disk
+                result cache instead of calling the API again.
         """
         self._client = genai.Client(api_key=api_key)
         self._working_folder = working_folder
-        self._lock = asyncio.Lock()
-        self._is_generating = False
+        self._slots = asyncio.Semaphore(max(1, max_concurrent_requests))
+        self._active_requests = 0
+        self._usage_lock = threading.Lock()
         self._usage_callback = usage_callback
+        self._reuse_identical_results = reuse_identical_results
         self._system_prompt_overrides = system_prompt_overrides or {}
+        # Composed system instructions by (system_prompt_key, style_prompt)
+        self._system_instructions: dict[tuple[Optional[str], str], str] = {}
 
     def set_system_prompt_overrides(self, overrides: dict[str, str]) -> None:
         """Update system prompt overrides.
@@ -85,6 +193,7 @@ class ImageService:
             overrides: Dict of system prompt key -> override text.
         """
         self._system_prompt_overrides = overrides or {}
+        self._system_instructions.clear()
 
     def get_system_prompt(self, key: str) -> str:
         """Get a system prompt, checking overrides first.
@@ -99,10 +208,40 @@ class ImageService:
             return self._system_prompt_overrides[key]
         return SYSTEM_PROMPTS.get(key, "")
 
+    def _system_instruction(
+        self, system_prompt_key: Optional[str], style_prompt: str
+    ) -> str:
+        """Compose the system instruction from the system prompt and style.
+
+        The result only changes with the overrides, so it is cached per
+        (key, style) until set_system_prompt_overrides is called.
+        """
+        cache_key = (system_prompt_key, style_prompt)
+        cached = self._system_instructions.get(cache_key)
+        if cached is not None:
+            return cached
+
+        system_instruction = ""
+        if system_prompt_key:
+            system_instruction = self.get_system_prompt(system_prompt_key)
+
+        # Add style prompt to system instruction
+        if style_prompt:
+            style_prefix = TEMPLATES.get("style_prefix", "Style: {style_prompt}")
+            formatted_style = style_prefix.format(style_prompt=style_prompt)
+            if system_instruction:
+                system_instruction += "\n\n" + formatted_style
+            else:
+                system_instruction = formatted_style
+
+        system_instruction = (system_instruction or "").strip()
+        self._system_instructions[cache_key] = system_instruction
+        return system_instruction
+
     @property
     def is_generating(self) -> bool:
         """Check if a generation is currently in progress."""
-        return self._is_generating
+        return self._active_requests > 0
 
     def _validate_prompt(self, prompt: str) -> str:
         cleaned = (prompt or "").strip()
@@ -122,11 +261,9 @@ class ImageService:
         refs: Optional[list[Path]] = None
         if reference_images:
             # Keep only existing files and cap the count to avoid huge payloads.
-            existing = [
-                p
-                for p in reference_images
-                if isinstance(p, Path) and p.exists() and p.is_file()
-            ]
+            candidates = [p for p in reference_images if isinstance(p, Path)]
+            present = stat_files(candidates)
+            existing = [p for p in candidates if p in present]
             if len(existing) > MAX_REFERENCE_IMAGES:
                 raise ImageGenerationError(
                     f"Too many reference images (max {MAX_REFERENCE_IMAGES})"
@@ -137,7 +274,7 @@ class ImageService:
         if sketch is not None:
             if not isinstance(sketch, Path):
                 raise ImageGenerationError("Invalid sketch path")
-            if sketch.exists() and sketch.is_file():
+            if sketch.is_file():
                 sketch_path = sketch
             elif sketch.exists():
                 raise ImageGenerationError("Sketch path is not a file")
@@ -147,23 +284,21 @@ class ImageService:
 
         return refs, sketch_path
 
-    def _get_mime_type(self, path: Path) -> str:
-        """Determine MIME type for an image file."""
-        mime_type, _ = mimetypes.guess_type(str(path))
-        return mime_type or "image/jpeg"
-
     def _load_image_as_part(self, image_path: Path) -> types.Part:
         """Load an image file and convert to Gemini Part.
 
+        Large images are downscaled to ``REFERENCE_MAX_EDGE`` before upload.
+
         Args:
             image_path: Path to the image file.
 
         Returns:
             Gemini Part object containing the image data.
         """
-        mime_type = self._get_mime_type(image_path)
-        with open(image_path, "rb") as f:
-            image_bytes = f.read()
+        stat = image_path.stat()
+        image_bytes, mime_type = _prepare_reference(
+            str(image_path), stat.st_mtime_ns, stat.st_size
+        )
         return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
     def _create_thumbnail(self, image_path: Path) -> Path:
@@ -175,21 +310,24 @@ class ImageService:
         Returns:
             Path to the created thumbnail.
         """
-        thumbnails_folder = self._working_folder / ".thumbnails"
-        thumbnails_folder.mkdir(parents=True, exist_ok=True)
-
-        thumbnail_path = thumbnails_folder / f"{image_path.stem}_thumb.png"
+        thumbnail_path = thumbnail_path_for(self._working_folder, image_path)
+        thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
 
         with Image.open(image_path) as img:
-            # Convert to RGB if necessary (handles RGBA, P mode, etc.)
-            if img.mode in ("RGBA", "P"):
+            # Palette images can only be resampled with NEAREST, so convert first.
+            if img.mode == "P":
                 img = img.convert("RGB")
 
-            # Calculate thumbnail size maintaining aspect ratio
+            # Calculate thumbnail size maintaining aspect ratio. JPEGs are
+            # decoded at a reduced scale via draft() (see reducing_gap).
             img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
-            img.save(thumbnail_path, "PNG")
 
-        logger.info(f"Created thumbnail: {thumbnail_path}")
+            # Convert the small image rather than the full-size source.
+            if img.mode == "RGBA":
+                img = img.convert("RGB")
+            img.save(thumbnail_path, "WEBP", quality=80, method=4)
+
+        logger.info("Created thumbnail: %s", thumbnail_path)
         return thumbnail_path
 
     def _save_generated_image(
@@ -206,10 +344,8 @@ class ImageService:
         Returns:
             Path to the saved image.
         """
-        from datetime import datetime
-
         # Determine file extension
-        extension = mimetypes.guess_extension(mime_type) or ".png"
+        extension = _extension_for(mime_type)
 
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
@@ -218,14 +354,64 @@ class ImageService:
         # Save to category folder
         category_folder = self._working_folder / category
         category_folder.mkdir(parents=True, exist_ok=True)
-        output_path = category_folder / filename
-
-        with open(output_path, "wb") as f:
-            f.write(data)
+        output_path = self._write_new_file(category_folder / filename, data)
 
         logger.info(f"Saved generated image: {output_path}")
         return output_path
 
+    @staticmethod
+    def _write_new_file(path: Path, data: bytes) -> Path:
+        """Write ``data`` to ``path``, or a numbered variant if it already exists.
+
+        Concurrent requests finishing within the same second would otherwise
+        get the same timestamped filename. Files are opened in exclusive mode,
+        so saves running in parallel threads cannot claim the same name.
+
+        Returns:
+            The path that was written.
+        """
+        candidate = path
+        counter = 2
+        while True:
+            try:
+                with open(candidate, "xb") as f:
+                    f.write(data)
+                return candidate
+            except FileExistsError:
+                candidate = path.with_name(f"{path.stem}_{counter}{path.suffix}")
+                counter += 1
+
+    async def _load_image_parts(
+        self, image_paths: list[Path]
+    ) -> list[Optional[types.Part]]:
+        """Read image files as Gemini Parts in executor threads.
+
+        Reads overlap (at most ``MAX_PARALLEL_READS`` at a time) so large
+        reference sets neither block the event loop nor load one by one.
+
+        Args:
+            image_paths: Image files to load.
+
+        Returns:
+            One Part per path, in order, or None where the file is missing.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_READS)
+
+        def load(image_path: Path) -> Optional[types.Part]:
+            # A missing file surfaces as FileNotFoundError from the stat
+            # that builds the cache key, so no separate exists() check is needed
+            try:
+                return self._load_image_as_part(image_path)
+            except FileNotFoundError:
+                return None
+
+        async def load_limited(image_path: Path) -> Optional[types.Part]:
+            async with semaphore:
+                return await loop.run_in_executor(None, load, image_path)
+
+        return await asyncio.gather(*(load_limited(p) for p in image_paths))
+
     def _build_prompt(
         self,
         user_prompt: str,
@@ -288,10 +474,14 @@ class ImageService:
             ImageGenerationError: If generation fails.
         """
         prompt = self._validate_prompt(prompt)
-        reference_images, sketch = self._validate_attachments(reference_images, sketch)
+        # File checks stat every attachment, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        reference_images, sketch = await loop.run_in_executor(
+            None, self._validate_attachments, reference_images, sketch
+        )
 
-        async with self._lock:
-            self._is_generating = True
+        async with self._slots:
+            self._active_requests += 1
             try:
                 return await self._generate_image_impl(
                     prompt=prompt,
@@ -307,7 +497,7 @@ class ImageService:
                     progress_callback=progress_callback,
                 )
             finally:
-                self._is_generating = False
+                self._active_requests -= 1
 
     async def _generate_image_impl(
         self,
@@ -327,64 +517,62 @@ class ImageService:
         # Build the user prompt (system instruction handled separately)
         full_prompt = self._build_prompt(prompt, style_prompt, system_prompt_key)
 
-        system_instruction = ""
-        if system_prompt_key:
-            system_instruction = self.get_system_prompt(system_prompt_key)
-
-        # Add style prompt to system instruction
-        if style_prompt:
-            style_prefix = TEMPLATES.get("style_prefix", "Style: {style_prompt}")
-            formatted_style = style_prefix.format(style_prompt=style_prompt)
-            if system_instruction:
-                system_instruction += "\n\n" + formatted_style
-            else:
-                system_instruction = formatted_style
-
-        system_instruction = (system_instruction or "").strip()
-
-        # Log the model and prompt details
-        logger.info("=" * 60)
-        logger.info(f"MODEL: {IMAGE_MODEL}")
-        logger.info(f"ASPECT RATIO: {aspect_ratio}")
-        logger.info(f"CATEGORY: {category}")
-        logger.info(f"Top-P: {p_threshold}, TEMPERATURE: {temperature}")
-        logger.info("-" * 60)
-        logger.info("PROMPT:")
-        logger.info(full_prompt)
+        system_instruction = self._system_instruction(system_prompt_key, style_prompt)
+
+        # Collect the model and prompt details, logged as one record below
+        log_lines = [
+            "=" * 60,
+            f"MODEL: {IMAGE_MODEL}",
+            f"ASPECT RATIO: {aspect_ratio}",
+            f"CATEGORY: {category}",
+            f"Top-P: {p_threshold}, TEMPERATURE: {temperature}",
+            "-" * 60,
+            "PROMPT:",
+            full_prompt,
+        ]
         if system_instruction:
-            logger.info("-" * 60)
-            logger.info("SYSTEM INSTRUCTION:")
-            logger.info(system_instruction)
-        logger.info("-" * 60)
+            log_lines += ["-" * 60, "SYSTEM INSTRUCTION:", system_instruction]
+        log_lines.append("-" * 60)
 
         # Build content parts
         parts = [types.Part.from_text(text=full_prompt)]
 
-        # Log and add reference images
+        # Load reference images and sketch together
+        reference_images = reference_images or []
+        loaded = await self._load_image_parts(
+            reference_images + ([sketch] if sketch else [])
+        )
+        sketch_part = loaded.pop() if sketch else None
+
+        # Add reference images
         attached_images = []
         if reference_images:
-            logger.info(f"REFERENCE IMAGES ({len(reference_images)} total):")
-            for image_path in reference_images:
-                if image_path.exists():
-                    parts.append(self._load_image_as_part(image_path))
+            log_lines.append(f"REFERENCE IMAGES ({len(reference_images)} total):")
+            for image_path, part in zip(reference_images, loaded):
+                if part is not None:
+                    parts.append(part)
                     attached_images.append(str(image_path))
-                    logger.info(f"  ✓ {image_path}")
+                    log_lines.append(f"  ✓ {image_path}")
                 else:
                     logger.warning(f"  ✗ Reference image not found: {image_path}")
         else:
-            logger.info("REFERENCE IMAGES: None")
+            log_lines.append("REFERENCE IMAGES: None")
 
         # Add sketch if provided
-        if sketch and sketch.exists():
-            parts.append(self._load_image_as_part(sketch))
+        if sketch_part is not None:
+            parts.append(sketch_part)
             attached_images.append(str(sketch))
-            logger.info(f"SKETCH: {sketch}")
+            log_lines.append(f"SKETCH: {sketch}")
         else:
-            logger.info("SKETCH: None")
+            log_lines.append("SKETCH: None")
 
-        logger.info("-" * 60)
-        logger.info(f"TOTAL IMAGES ATTACHED: {len(attached_images)}")
-        logger.info("=" * 60)
+        log_lines += [
+            "-" * 60,
+            f"TOTAL IMAGES ATTACHED: {len(attached_images)}",
+            "=" * 60,
+        ]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n".join(log_lines))
 
         # Create content
         contents = [
@@ -406,9 +594,9 @@ class ImageService:
         # Run generation in executor to not block event loop
         if progress_callback:
             progress_callback("Waiting for Gemini to finish image generation...")
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         api_result = await loop.run_in_executor(
-            None, lambda: self._call_api(contents, config)
+            None, self._call_api_cached, contents, config
         )
 
         if api_result is None:
@@ -418,18 +606,85 @@ class ImageService:
 
         if progress_callback:
             progress_callback("Saving generated image...")
-        image_path = self._save_generated_image(
-            data=image_bytes,
-            mime_type=mime_type,
-            category=category,
+        # Post-processing runs off the event loop so other requests and the
+        # UI are not held up by file writes and image decoding.
+        image_path = await loop.run_in_executor(
+            None,
+            partial(
+                self._save_generated_image,
+                data=image_bytes,
+                mime_type=mime_type,
+                category=category,
+            ),
         )
 
         if progress_callback:
             progress_callback("Creating thumbnail...")
-        thumbnail_path = self._create_thumbnail(image_path)
+        thumbnail_path = await loop.run_in_executor(
+            _THUMBNAIL_POOL, self._create_thumbnail, image_path
+        )
 
         return (image_path, thumbnail_path)
 
+    def _result_cache_key(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> str:
+        """Hash everything that is sent to the API for one request."""
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(IMAGE_MODEL.encode("utf-8"))
+        hasher.update(config.model_dump_json(exclude_none=True).encode("utf-8"))
+        for content in contents:
+            for part in content.parts or []:
+                if part.text:
+                    hasher.update(part.text.encode("utf-8"))
+                if part.inline_data and part.inline_data.data:
+                    hasher.update((part.inline_data.mime_type or "").encode("utf-8"))
+                    hasher.update(part.inline_data.data)
+        return hasher.hexdigest()
+
+    def _call_api_cached(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> Optional[tuple[bytes, str]]:
+        """Call the API, or reuse a cached result for an identical request.
+
+        The cache is only consulted when ``reuse_identical_results`` is set,
+        since repeating a request is normally how users ask for a variation.
+        Entries live in the working folder and the least recently used ones
+        are evicted beyond ``RESULT_CACHE_MAX_ENTRIES``.
+        """
+        if not self._reuse_identical_results:
+            return self._call_api(contents, config)
+
+        cache_folder = self._working_folder / RESULT_CACHE_FOLDER
+        key = self._result_cache_key(contents, config)
+
+        for cached in cache_folder.glob(f"{key}.*"):
+            mime_type = mimetypes.guess_type(cached.name)[0] or "image/png"
+            logger.info(f"Reusing cached result for identical request: {cached}")
+            os.utime(cached)  # Mark as recently used
+            return (cached.read_bytes(), mime_type)
+
+        result = self._call_api(contents, config)
+        if result is None:
+            return None
+
+        image_bytes, mime_type = result
+        try:
+            cache_folder.mkdir(parents=True, exist_ok=True)
+            extension = _extension_for(mime_type)
+            (cache_folder / f"{key}{extension}").write_bytes(image_bytes)
+
+            entries = sorted(cache_folder.iterdir(), key=lambda p: p.stat().st_mtime)
+            for stale in entries[:-RESULT_CACHE_MAX_ENTRIES]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to cache generation result: {e}")
+        return result
+
     def _call_api(
         self,
         contents: list[types.Content],
@@ -472,13 +727,16 @@ class ImageService:
                 for part in chunk.candidates[0].content.parts:
                     if part is None:
                         continue
-                    if getattr(part, "inline_data", None) and part.inline_data.data:
-                        image_bytes = part.inline_data.data
-                        mime_type = part.inline_data.mime_type
-                    elif getattr(part, "text", None):
+                    # Resolve each attribute once per part
+                    inline_data = getattr(part, "inline_data", None)
+                    if inline_data and inline_data.data:
+                        image_bytes = inline_data.data
+                        mime_type = inline_data.mime_type
+                        continue
+                    text = getattr(part, "text", None)
+                    if text:
                         # Log any text response (often contains explanation or error)
-                        if part.text:
-                            logger.info(f"API text response: {part.text}")
+                        logger.info(f"API text response: {text}")
 
                 if (
                     image_bytes is not None
@@ -489,8 +747,10 @@ class ImageService:
                     break
 
             if self._usage_callback is not None and usage is not None:
+                # Concurrent requests report usage from different threads
                 try:
-                    self._usage_callback(usage)
+                    with self._usage_lock:
+                        self._usage_callback(usage)
                 except Exception as e:  # pragma: no cover
                     logger.debug(f"Usage callback failed: {e}")
 
@@ -580,11 +840,39 @@ class ImageService:
         Returns:
             Path to the thumbnail, or None if it doesn't exist.
         """
-        thumbnail_path = (
-            self._working_folder / ".thumbnails" / f"{image_path.stem}_thumb.png"
-        )
+        thumbnail_path = thumbnail_path_for(self._working_folder, image_path)
         return thumbnail_path if thumbnail_path.exists() else None
 
+    def remove_legacy_thumbnails(self) -> int:
+        """Delete PNG thumbnails left over from before thumbnails were WebP.
+
+        They are never shown again, and the WebP replacement is created when
+        the image is next displayed.
+
+        Returns:
+            Number of files removed.
+        """
+        folder = self._working_folder / ".thumbnails"
+        removed = 0
+        try:
+            with os.scandir(folder) as entries:
+                legacy = [
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(LEGACY_THUMBNAIL_SUFFIX)
+                ]
+        except OSError:
+            return 0
+        for path in legacy:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Could not remove old thumbnail {path}: {e}")
+        if removed:
+            logger.info(f"Removed {removed} old PNG thumbnails")
+        return removed
+
     def ensure_thumbnail(self, image_path: Path) -> Path:
         """Ensure a thumbnail exists for the image, creating if needed.
 
@@ -599,6 +887,41 @@ class ImageService:
             return existing
         return self._create_thumbnail(image_path)
 
+    async def ensure_thumbnails(self, image_paths: list[Path]) -> dict[Path, Path]:
+        """Ensure thumbnails exist for several images, creating missing ones in parallel.
+
+        Missing thumbnails are created on the thumbnail pool and awaited, so
+        the event loop keeps serving the UI in the meantime.
+
+        Args:
+            image_paths: Paths to the full-size images.
+
+        Returns:
+            Mapping of image path to thumbnail path for every image that has one.
+        """
+        thumbnails: dict[Path, Path] = {}
+        futures = {}
+        for image_path in image_paths:
+            existing = self.get_thumbnail_path(image_path)
+            if existing:
+                thumbnails[image_path] = existing
+            else:
+                futures[image_path] = _THUMBNAIL_POOL.submit(
+                    self._create_thumbnail, image_path
+                )
+
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures.values()),
+            return_exceptions=True,
+        )
+        for image_path, result in zip(futures, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to create thumbnail for {image_path}: {result}")
+            else:
+                thumbnails[image_path] = result
+
+        return thumbnails
+
     async def rework_image(
         self,
         original_image: Path,
@@ -639,15 +962,20 @@ class ImageService:
         """
         prompt = self._validate_prompt(prompt)
 
-        if not original_image.exists():
-            raise ImageGenerationError(f"Original image not found: {original_image}")
-
         # Build reference list with original image first
         reference_images = [original_image]
         if additional_references:
             reference_images.extend(additional_references)
 
-        reference_images, sketch = self._validate_attachments(reference_images, sketch)
+        # File checks stat every attachment, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        reference_images, sketch = await loop.run_in_executor(
+            None, self._validate_attachments, reference_images, sketch
+        )
+
+        # Validation drops missing files, so the original must still lead
+        if not reference_images or reference_images[0] != original_image:
+            raise ImageGenerationError(f"Original image not found: {original_image}")
 
         # Determine system prompt based on category
         system_prompt_key = "rework_page" if category == "pages" else "rework_character"
@@ -659,8 +987,8 @@ class ImageService:
         )
         full_user_prompt = rework_template.format(prompt=prompt)
 
-        async with self._lock:
-            self._is_generating = True
+        async with self._slots:
+            self._active_requests += 1
             try:
                 return await self._rework_image_impl(
                     prompt=full_user_prompt,
@@ -677,7 +1005,7 @@ class ImageService:
                     progress_callback=progress_callback,
                 )
             finally:
-                self._is_generating = False
+                self._active_requests -= 1
 
     async def _rework_image_impl(
         self,
@@ -698,64 +1026,62 @@ class ImageService:
         # Build the user prompt
         full_prompt = self._build_prompt(prompt, style_prompt, system_prompt_key)
 
-        system_instruction = ""
-        if system_prompt_key:
-            system_instruction = self.get_system_prompt(system_prompt_key)
-
-        # Add style prompt to system instruction
-        if style_prompt:
-            style_prefix = TEMPLATES.get("style_prefix", "Style: {style_prompt}")
-            formatted_style = style_prefix.format(style_prompt=style_prompt)
-            if system_instruction:
-                system_instruction += "\n\n" + formatted_style
-            else:
-                system_instruction = formatted_style
-
-        system_instruction = (system_instruction or "").strip()
-
-        # Log the model and prompt details
-        logger.info("=" * 60)
-        logger.info(f"REWORK IMAGE - MODEL: {IMAGE_MODEL}")
-        logger.info(f"ORIGINAL: {original_image}")
-        logger.info(f"ASPECT RATIO: {aspect_ratio}")
-        logger.info(f"CATEGORY: {category}")
-        logger.info(f"Top-P: {p_threshold}, TEMPERATURE: {temperature}")
-        logger.info("-" * 60)
-        logger.info("PROMPT:")
-        logger.info(full_prompt)
+        system_instruction = self._system_instruction(system_prompt_key, style_prompt)
+
+        # Collect the model and prompt details, logged as one record below
+        log_lines = [
+            "=" * 60,
+            f"REWORK IMAGE - MODEL: {IMAGE_MODEL}",
+            f"ORIGINAL: {original_image}",
+            f"ASPECT RATIO: {aspect_ratio}",
+            f"CATEGORY: {category}",
+            f"Top-P: {p_threshold}, TEMPERATURE: {temperature}",
+            "-" * 60,
+            "PROMPT:",
+            full_prompt,
+        ]
         if system_instruction:
-            logger.info("-" * 60)
-            logger.info("SYSTEM INSTRUCTION:")
-            logger.info(system_instruction)
-        logger.info("-" * 60)
+            log_lines += ["-" * 60, "SYSTEM INSTRUCTION:", system_instruction]
+        log_lines.append("-" * 60)
 
         # Build content parts
         parts = [types.Part.from_text(text=full_prompt)]
 
-        # Log and add reference images (original first)
+        # Load reference images and sketch together
+        reference_images = reference_images or []
+        loaded = await self._load_image_parts(
+            reference_images + ([sketch] if sketch else [])
+        )
+        sketch_part = loaded.pop() if sketch else None
+
+        # Add reference images (original first)
         attached_images = []
         if reference_images:
-            logger.info(f"REFERENCE IMAGES ({len(reference_images)} total):")
-            for image_path in reference_images:
-                if image_path.exists():
-                    parts.append(self._load_image_as_part(image_path))
+            log_lines.append(f"REFERENCE IMAGES ({len(reference_images)} total):")
+            for image_path, part in zip(reference_images, loaded):
+                if part is not None:
+                    parts.append(part)
                     attached_images.append(str(image_path))
                     marker = "[ORIGINAL]" if image_path == original_image else ""
-                    logger.info(f"  ✓ {image_path} {marker}")
+                    log_lines.append(f"  ✓ {image_path} {marker}")
                 else:
                     logger.warning(f"  ✗ Reference image not found: {image_path}")
 
         # Add sketch if provided
-        if sketch and sketch.exists():
-            parts.append(self._load_image_as_part(sketch))
+        if sketch_part is not None:
+            parts.append(sketch_part)
             attached_images.append(str(sketch))
-            logger.info(f"SKETCH: {sketch}")
+            log_lines.append(f"SKETCH: {sketch}")
         else:
-            logger.info("SKETCH: None")
+            log_lines.append("SKETCH: None")
 
-        logger.info("-" * 60)
-        logger.info(f"TOTAL IMAGES ATTACHED: {len(attached_images)}")
-        logger.info("=" * 60)
+        log_lines += [
+            "-" * 60,
+            f"TOTAL IMAGES ATTACHED: {len(attached_images)}",
+            "=" * 60,
+        ]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n".join(log_lines))
 
         # Create content
         contents = [
@@ -777,9 +1103,9 @@ class ImageService:
         # Run generation in executor to not block event loop
         if progress_callback:
             progress_callback("Waiting for Gemini to finish image generation...")
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         api_result = await loop.run_in_executor(
-            None, lambda: self._call_api(contents, config)
+            None, self._call_api_cached, contents, config
         )
 
         if api_result is None:
@@ -790,17 +1116,23 @@ class ImageService:
         if progress_callback:
             progress_callback("Saving reworked image...")
 
-        # Save with rework prefix
-        image_path = self._save_reworked_image(
-            data=image_bytes,
-            mime_type=mime_type,
-            category=category,
-            original_name=original_image.stem,
+        # Save with rework prefix, off the event loop like generation
+        image_path = await loop.run_in_executor(
+            None,
+            partial(
+                self._save_reworked_image,
+                data=image_bytes,
+                mime_type=mime_type,
+                category=category,
+                original_name=original_image.stem,
+            ),
         )
 
         if progress_callback:
             progress_callback("Creating thumbnail...")
-        thumbnail_path = self._create_thumbnail(image_path)
+        thumbnail_path = await loop.run_in_executor(
+            _THUMBNAIL_POOL, self._create_thumbnail, image_path
+        )
 
         return (image_path, thumbnail_path)
 
@@ -822,10 +1154,8 @@ class ImageService:
         Returns:
             Path to the saved image.
         """
-        from datetime import datetime
-
         # Determine file extension
-        extension = mimetypes.guess_extension(mime_type) or ".png"
+        extension = _extension_for(mime_type)
 
         # Generate filename with rework prefix and timestamp
         timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
@@ -834,10 +1164,7 @@ class ImageService:
         # Save to category folder
         category_folder = self._working_folder / category
         category_folder.mkdir(parents=True, exist_ok=True)
-        output_path = category_folder / filename
-
-        with open(output_path, "wb") as f:
-            f.write(data)
+        output_path = self._write_new_file(category_folder / filename, data)
 
         logger.info(f"Saved reworked image: {output_path}")
         return output_path
@@ -5,6 +5,8 @@ Provides a single entry point to configure logging consistently across the app.
 Requirements:
 - Log to stdout for interactive debugging.
 - Log to a rotating file inside the current project folder (working folder).
+- Keep handler I/O off the calling thread: records are queued and written by a
+  background listener.
 
 The app calls :func:`configure_logging` on startup, and can call it again when the
 working folder changes.
@@ -12,15 +14,34 @@ working folder changes.
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
 
 DEFAULT_LOG_FILENAME = "BuchJa.log"
 
+# Background thread writing queued records to the stdout and file handlers.
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and close the handlers of the running listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def configure_logging(
     *,
@@ -37,6 +58,7 @@ def configure_logging(
     Returns:
         The resolved path to the log file.
     """
+    global _listener
     resolved_project = (project_folder or Path.cwd()).resolve()
     log_dir = resolved_project / "logs"
 
@@ -65,6 +87,7 @@ def configure_logging(
     # multiple times (e.g., when the working folder changes).
     for handler in list(root.handlers):
         root.removeHandler(handler)
+    _stop_listener()
 
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
@@ -84,8 +107,14 @@ def configure_logging(
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
 
-    root.addHandler(stream_handler)
-    root.addHandler(file_handler)
+    # Logging calls only enqueue the record; formatting, writing and rotation
+    # happen on the listener thread.
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    root.addHandler(QueueHandler(log_queue))
 
     # Keep noisy libraries from drowning our logs.
     logging.getLogger("google").setLevel(logging.WARNING)
@@ -3,16 +3,33 @@
 Uses ReportLab (BSD license) to compile book pages into a PDF document.
 """
 
+import importlib.util
+import io
 import logging
+import os
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 from PIL import Image
 
+from src.services.fs_utils import stat_files
+
 logger = logging.getLogger(__name__)
 
+# ReportLab 4 ships its C accelerator as the optional rl_accel package and
+# silently falls back to slower pure-Python string and number formatting.
+if not (
+    importlib.util.find_spec("_rl_accel")
+    or importlib.util.find_spec("reportlab.lib._rl_accel")
+):
+    logger.debug("ReportLab C accelerator (rl_accel) not found; using pure Python")
+
 # Aspect ratio to page size mapping
 ASPECT_RATIO_SIZES = {
     "1:1": (8 * inch, 8 * inch),
@@ -22,6 +39,53 @@ ASPECT_RATIO_SIZES = {
     "9:16": (5.625 * inch, 10 * inch),
 }
 
+# Highest resolution worth embedding; larger page images are downsampled.
+PRINT_DPI = 300
+
+# JPEG quality for downsampled JPEG pages, which are re-encoded as JPEG.
+PAGE_JPEG_QUALITY = 90
+
+# PIL releases the GIL while decoding and resampling, so page images are
+# prepared in parallel threads while the canvas is filled in order.
+_PAGE_WORKERS = min(8, os.cpu_count() or 1)
+_PAGE_POOL = ThreadPoolExecutor(
+    max_workers=_PAGE_WORKERS, thread_name_prefix="pdf-page"
+)
+
+# How many pages are prepared ahead of the one being drawn. This bounds how
+# many downsampled images are held in memory at once.
+PAGE_PREFETCH = 2 * _PAGE_WORKERS
+
+
+@lru_cache(maxsize=512)
+def _image_size(path: str, mtime_ns: int, size: int) -> tuple[int, int]:
+    """Read an image's pixel size from its header.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key, so repeated
+    exports of an unchanged book do not parse the page images again.
+    """
+    with Image.open(path) as img:
+        return img.size
+
+
+@lru_cache(maxsize=64)
+def _custom_page_size(aspect_ratio: str) -> tuple[float, float]:
+    """Parse a custom aspect ratio string into a page size in points."""
+    try:
+        w, h = aspect_ratio.split(":")
+        ratio = float(w) / float(h)
+
+        # Base on A4 size
+        if ratio >= 1:
+            # Landscape-ish
+            return (8 * inch, 8 * inch / ratio)
+        else:
+            # Portrait-ish
+            return (8 * inch * ratio, 8 * inch)
+    except (ValueError, ZeroDivisionError):
+        logger.warning(f"Invalid aspect ratio: {aspect_ratio}, using 3:4")
+        return ASPECT_RATIO_SIZES["3:4"]
+
 
 class PdfExportError(Exception):
     """Raised when PDF export fails."""
@@ -47,22 +111,7 @@ class PdfService:
         """
         if aspect_ratio in ASPECT_RATIO_SIZES:
             return ASPECT_RATIO_SIZES[aspect_ratio]
-
-        # Parse custom aspect ratio
-        try:
-            w, h = aspect_ratio.split(":")
-            ratio = float(w) / float(h)
-
-            # Base on A4 size
-            if ratio >= 1:
-                # Landscape-ish
-                return (8 * inch, 8 * inch / ratio)
-            else:
-                # Portrait-ish
-                return (8 * inch * ratio, 8 * inch)
-        except (ValueError, ZeroDivisionError):
-            logger.warning(f"Invalid aspect ratio: {aspect_ratio}, using 3:4")
-            return ASPECT_RATIO_SIZES["3:4"]
+        return _custom_page_size(aspect_ratio)
 
     def _get_image_dimensions(self, image_path: Path) -> tuple[int, int]:
         """Get the dimensions of an image file.
@@ -73,8 +122,59 @@ class PdfService:
         Returns:
             Tuple of (width, height) in pixels.
         """
+        stat = image_path.stat()
+        return _image_size(str(image_path), stat.st_mtime_ns, stat.st_size)
+
+    def _get_page_source(
+        self,
+        image_path: Path,
+        page_width: float,
+        page_height: float,
+        dpi: int = PRINT_DPI,
+    ) -> tuple[Union[str, ImageReader], tuple[int, int]]:
+        """Open a page image once and return what to embed plus its size.
+
+        Images that exceed ``dpi`` at the given page size are downsampled
+        in memory; JPEGs are re-encoded as JPEG so photo pages stay
+        DCT-compressed in the PDF. Others are embedded from the file as-is,
+        which lets ReportLab pass JPEG data through without re-encoding; their
+        size comes from the header cache, so PIL does not open them again.
+
+        Args:
+            image_path: Path to the page image.
+            page_width: Page width in points.
+            page_height: Page height in points.
+            dpi: Highest resolution to embed.
+
+        Returns:
+            Tuple of (image source for drawImage, (width, height) in pixels).
+        """
+        max_size = (
+            int(page_width / inch * dpi),
+            int(page_height / inch * dpi),
+        )
+        width, height = self._get_image_dimensions(image_path)
+        if width <= max_size[0] and height <= max_size[1]:
+            return str(image_path), (width, height)
+
         with Image.open(image_path) as img:
-            return img.size
+            is_jpeg = img.format == "JPEG"
+            img.thumbnail(max_size, Image.LANCZOS)
+            logger.info(
+                "Downsampled %s to %dx%d for %d DPI",
+                image_path.name,
+                img.width,
+                img.height,
+                dpi,
+            )
+            if not is_jpeg:
+                return ImageReader(img.copy()), img.size
+
+            # ReportLab embeds JPEG data as-is, but raw pixels Flate-compressed
+            buffer = io.BytesIO()
+            img.save(buffer, "JPEG", quality=PAGE_JPEG_QUALITY)
+            buffer.seek(0)
+            return ImageReader(buffer), img.size
 
     def create_pdf(
         self,
@@ -83,6 +183,7 @@ class PdfService:
         aspect_ratio: str = "3:4",
         title: str = "My Book",
         author: str = "BuchJa",
+        dpi: int = PRINT_DPI,
     ) -> Path:
         """Create a PDF from a list of page images.
 
@@ -92,6 +193,7 @@ class PdfService:
             aspect_ratio: Aspect ratio for page sizing.
             title: PDF document title.
             author: PDF document author.
+            dpi: Highest resolution to embed; larger images are downsampled.
 
         Returns:
             Path to the created PDF file.
@@ -117,14 +219,47 @@ class PdfService:
             c.setAuthor(author)
             c.setCreator("BuchJa")
 
-            # Add each page
+            existing = stat_files(page_images)
+            pages = []
             for i, image_path in enumerate(page_images):
-                if not image_path.exists():
-                    logger.warning(f"Page image not found, skipping: {image_path}")
-                    continue
+                if image_path in existing:
+                    pages.append((i, image_path))
+                else:
+                    logger.warning("Page image not found, skipping: %s", image_path)
+
+            # Pages that repeat an image (e.g. the cover reused as back page)
+            # share one source, so it is resampled once and ReportLab embeds
+            # a single image object for all of them. A source is dropped once
+            # its last page has been drawn.
+            uses_left = Counter(image_path for _, image_path in pages)
+            sources: dict[
+                Path, Future[tuple[Union[str, ImageReader], tuple[int, int]]]
+            ] = {}
+
+            def prefetch(index: int) -> None:
+                if index < len(pages):
+                    _, image_path = pages[index]
+                    if image_path not in sources:
+                        sources[image_path] = _PAGE_POOL.submit(
+                            self._get_page_source,
+                            image_path,
+                            page_width,
+                            page_height,
+                            dpi,
+                        )
+
+            for index in range(PAGE_PREFETCH):
+                prefetch(index)
+
+            # Add each page
+            for index, (i, image_path) in enumerate(pages):
+                prefetch(index + PAGE_PREFETCH)
 
-                # Get image dimensions
-                img_width, img_height = self._get_image_dimensions(image_path)
+                # Read the image once for its size and, if oversized, resample
+                source, (img_width, img_height) = sources[image_path].result()
+                uses_left[image_path] -= 1
+                if not uses_left[image_path]:
+                    del sources[image_path]
 
                 # Calculate scaling to fit page while maintaining aspect ratio
                 scale_x = page_width / img_width
@@ -139,7 +274,7 @@ class PdfService:
 
                 # Draw image
                 c.drawImage(
-                    str(image_path),
+                    source,
                     x,
                     y,
                     width=scaled_width,
@@ -151,7 +286,8 @@ class PdfService:
                 if i < len(page_images) - 1:
                     c.showPage()
 
-                logger.info(f"Added page {i + 1}: {image_path.name}")
+                # Per-page messages are formatted lazily, only if INFO is enabled
+                logger.info("Added page %d: %s", i + 1, image_path.name)
 
             # Save PDF
             c.save()
@@ -171,6 +307,7 @@ class PdfService:
         aspect_ratio: str = "3:4",
         title: str = "My Book",
         author: str = "BuchJa",
+        dpi: int = PRINT_DPI,
     ) -> Path:
         """Create a PDF with a cover page.
 
@@ -181,6 +318,7 @@ class PdfService:
             aspect_ratio: Aspect ratio for page sizing.
             title: PDF document title.
             author: PDF document author.
+            dpi: Highest resolution to embed; larger images are downsampled.
 
         Returns:
             Path to the created PDF file.
@@ -196,6 +334,7 @@ class PdfService:
             aspect_ratio=aspect_ratio,
             title=title,
             author=author,
+            dpi=dpi,
         )
 
     def estimate_file_size(self, page_images: list[Path]) -> int:
@@ -207,12 +346,13 @@ class PdfService:
         Returns:
             Estimated size in bytes.
         """
+        stats = stat_files(page_images)
         total_size = 0
         for path in page_images:
-            if path.exists():
+            if path in stats:
                 # Rough estimate: PDF overhead + compressed image
                 # Images in PDF are typically 60-80% of original size
-                total_size += int(path.stat().st_size * 0.7)
+                total_size += int(stats[path].st_size * 0.7)
 
         # Add PDF overhead (metadata, structure)
         total_size += 10000  # ~10KB overhead
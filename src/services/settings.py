@@ -31,10 +31,12 @@ GEMINI_USAGE_KEY = "gemini_usage"
 try:
     SUPPORTED_GEMINI_MODELS = get_supported_models_for_usage_tracking()
 except Exception:  # pragma: no cover
-    SUPPORTED_GEMINI_MODELS = {
-        "gemini-3-pro-image-preview",
-        "gemini-3-pro-preview",
-    }
+    SUPPORTED_GEMINI_MODELS = frozenset(
+        {
+            "gemini-3-pro-image-preview",
+            "gemini-3-pro-preview",
+        }
+    )
 
 
 def _utc_now_iso() -> str:
@@ -362,6 +364,31 @@ class Settings:
             self._config["temperature"] = value
             self._save_config()
 
+    @property
+    def reuse_identical_generations(self) -> bool:
+        """Get whether identical generation requests reuse the cached result."""
+        return self._config.get("reuse_identical_generations", False)
+
+    @reuse_identical_generations.setter
+    def reuse_identical_generations(self, value: bool) -> None:
+        """Set whether identical generation requests reuse the cached result."""
+        self._config["reuse_identical_generations"] = bool(value)
+        self._save_config()
+
+    @property
+    def max_concurrent_generations(self) -> int:
+        """Get how many generation requests may run against Gemini at once."""
+        return self._config.get("max_concurrent_generations", 4)
+
+    @max_concurrent_generations.setter
+    def max_concurrent_generations(self, value: int) -> None:
+        """Set how many generation requests may run against Gemini at once."""
+        if not (1 <= value <= 8):
+            raise ValueError("Concurrent generations must be between 1 and 8")
+
+        self._config["max_concurrent_generations"] = value
+        self._save_config()
+
     # --- System Prompt Overrides ---
 
     def get_system_prompt_override(self, key: str) -> Optional[str]:
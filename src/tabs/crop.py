@@ -1,10 +1,19 @@
 import logging
+import asyncio
+from functools import partial
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 from nicegui import ui
 from src.app import APP
-from src._utils import notify_error, check_folder_changes
+from src._utils import (
+    notify_error,
+    check_folder_changes,
+    get_display_path,
+    prepare_thumbnails,
+    thumbnail_image,
+    GRID_PAGE_SIZE,
+)
 from src.components.image_cropper import (
     ImageCropper,
     save_cropped_image,
@@ -68,14 +77,24 @@ def build_crop_tab():
                     on_error=on_error,
                 )
 
-            def load_image_for_cropping(image_path: Path):
+            async def load_image_for_cropping(image_path: Path):
                 selected_source_path[0] = image_path
                 current_image_label.text = f"Cropping: {image_path.name}"
 
-                # Load the image into cropper
-                data_url = image_to_data_url(image_path)
+                # Encode off the event loop, then load straight into the cropper
+                # (the component itself waits for Cropper.js and the image).
+                loop = asyncio.get_running_loop()
+                data_url = await loop.run_in_executor(
+                    None, image_to_data_url, image_path
+                )
                 cropper.load_image(data_url)
 
+            crop_visible_count = [GRID_PAGE_SIZE]
+
+            def show_more_crop_sources():
+                crop_visible_count[0] += GRID_PAGE_SIZE
+                build_crop_source_grid()
+
             def build_crop_source_grid():
                 crop_source_container.clear()
                 with crop_source_container:
@@ -103,8 +122,13 @@ def build_crop_tab():
                         "text-sm font-medium mb-2"
                     )
 
+                    visible_images = all_images[: crop_visible_count[0]]
+                    prepare_thumbnails(
+                        [Path(img["path"]) for img in visible_images if img.get("path")]
+                    )
+
                     with ui.element("div").classes("grid grid-cols-6 gap-2"):
-                        for img in all_images:
+                        for img in visible_images:
                             img_path = img.get("path")
                             img_name = img.get(
                                 "name", Path(img_path).stem if img_path else "Unknown"
@@ -112,56 +136,43 @@ def build_crop_tab():
 
                             if img_path:
                                 full_path = Path(img_path)
-                                if not full_path.is_absolute():
-                                    full_path = APP.settings.working_folder / img_path
-
-                                thumb_path = None
-                                if APP.image_service:
-                                    try:
-                                        thumb_path = APP.image_service.ensure_thumbnail(
-                                            full_path
-                                        )
-                                    except Exception as e:
-                                        logger.warning(
-                                            f"Failed to ensure thumbnail for {full_path}: {e}"
-                                        )
-
-                                if not thumb_path:
-                                    thumb_path = (
-                                        APP.settings.working_folder
-                                        / ".thumbnails"
-                                        / f"{full_path.stem}_thumb.png"
-                                    )
-
-                                display_path = (
-                                    thumb_path if thumb_path.exists() else full_path
-                                )
 
-                                if display_path.exists():
+                                display_path = get_display_path(full_path)
+                                if display_path:
                                     with ui.card().classes(
                                         "cursor-pointer p-1 hover:shadow-md transition-shadow"
                                     ) as card:
                                         with ui.element("div").classes(
                                             "w-full h-16 bg-gray-100 flex items-center justify-center rounded"
                                         ):
-                                            ui.image(str(display_path)).props(
-                                                "fit=contain"
-                                            ).classes("w-full h-full")
+                                            thumbnail_image(
+                                                full_path, display_path
+                                            ).props("fit=contain").classes(
+                                                "w-full h-full"
+                                            )
                                         ui.label(img_name[:12]).classes(
                                             "text-xs truncate text-center"
                                         )
 
-                                        def select_for_crop(card=card, path=full_path):
-                                            load_image_for_cropping(path)
-
-                                        card.on("click", select_for_crop)
+                                        card.on(
+                                            "click",
+                                            partial(load_image_for_cropping, full_path),
+                                        )
 
-            # Initial build
-            build_crop_source_grid()
+                    remaining = len(all_images) - len(visible_images)
+                    if remaining > 0:
+                        ui.button(
+                            f"Show more ({remaining} remaining)",
+                            on_click=show_more_crop_sources,
+                        ).props("flat dense").classes("mt-2")
 
             ui.button("↻ Refresh Images", on_click=build_crop_source_grid).props(
                 "flat dense"
             ).classes("mt-2")
 
-    # Register refresh callbacks
-    APP.register_refresh_callback(build_crop_source_grid)
+    # Initial build happens once the tab is opened
+    def build_grid():
+        build_crop_source_grid()
+        APP.register_refresh_callback(build_crop_source_grid)
+
+    APP.defer_until_tab_shown("Crop", build_grid)
@@ -1,14 +1,19 @@
 import logging
 import asyncio
+import os
 import platform
 import subprocess
-from pathlib import Path
+from functools import partial
 from nicegui import ui
 from src.app import APP
 from src._utils import notify_error
+from src.services.pdf_service import PdfService
 
 logger = logging.getLogger(__name__)
 
+# Stateless, so a single instance serves every export.
+_PDF_SERVICE = PdfService()
+
 
 def build_export_tab():
     """Build the Export tab content for creating PDFs."""
@@ -35,56 +40,35 @@ def build_export_tab():
                     notify_error("No project data found!")
                     return
 
-                pages = APP.project_manager.get_ordered_pages()
-                if not pages:
+                page_paths = APP.project_manager.get_ordered_page_paths()
+                if not page_paths:
                     ui.notify("No pages to export!", type="warning")
                     return
 
-                from src.services.pdf_service import PdfService
-
-                pdf_service = PdfService()
                 # Save exports to root working folder
                 export_folder = APP.settings.working_folder
 
                 if export_folder:
                     output_path = export_folder / f"{filename_input.value}.pdf"
 
+                    # PdfService decodes pages on its own thread pool, where
+                    # PIL releases the GIL, so a thread keeps the UI responsive
+                    # and its log records reach the app's handlers.
+                    loop = asyncio.get_running_loop()
+                    run = partial(
+                        loop.run_in_executor,
+                        None,
+                        _PDF_SERVICE.create_pdf,
+                        page_paths,
+                        output_path,
+                        APP.settings.aspect_ratio,
+                    )
                     try:
-                        page_paths: list[Path] = []
-                        for p in pages:
-                            raw_path = p.get("path")
-                            if not raw_path:
-                                continue
-                            page_path = Path(raw_path)
-                            if (
-                                not page_path.is_absolute()
-                                and APP.settings
-                                and APP.settings.working_folder
-                            ):
-                                page_path = APP.settings.working_folder / page_path
-                            page_paths.append(page_path)
-
                         if APP.status_footer:
                             async with APP.status_footer.busy("Exporting PDF..."):
-                                loop = asyncio.get_event_loop()
-                                await loop.run_in_executor(
-                                    None,
-                                    lambda: pdf_service.create_pdf(
-                                        page_paths,
-                                        output_path,
-                                        APP.settings.aspect_ratio,
-                                    ),
-                                )
+                                await run()
                         else:
-                            loop = asyncio.get_event_loop()
-                            await loop.run_in_executor(
-                                None,
-                                lambda: pdf_service.create_pdf(
-                                    page_paths,
-                                    output_path,
-                                    APP.settings.aspect_ratio,
-                                ),
-                            )
+                            await run()
                         ui.notify(f"PDF exported: {output_path}", type="positive")
                     except Exception as e:
                         logger.exception("PDF export failed")
@@ -106,12 +90,19 @@ def build_export_tab():
 
                 try:
                     if platform.system() == "Windows":
-                        # Use explorer to open folder, which handles bringing to front/new window better
-                        subprocess.Popen(["explorer", str(folder)])
-                    elif platform.system() == "Darwin":
-                        subprocess.Popen(["open", str(folder)])
+                        # ShellExecute directly, without starting explorer.exe
+                        os.startfile(folder)
                     else:
-                        subprocess.Popen(["xdg-open", str(folder)])
+                        opener = "open" if platform.system() == "Darwin" else "xdg-open"
+                        # Detached and without our stdio or file descriptors
+                        subprocess.Popen(
+                            [opener, str(folder)],
+                            stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL,
+                            close_fds=True,
+                            start_new_session=True,
+                        )
                 except Exception as e:
                     logger.error(f"Failed to open folder {folder}: {e}")
                     ui.notify(f"Could not open folder: {e}", type="negative")
@@ -1,14 +1,36 @@
 import logging
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional
 from nicegui import ui
 from src.app import APP
-from src._utils import notify_error
+from src._utils import (
+    notify_error,
+    debounce,
+    get_display_path,
+    prepare_thumbnails,
+    thumbnail_image,
+    GRID_PAGE_SIZE,
+)
 from src.services.image_service import ImageGenerationError, SYSTEM_PROMPTS, TEMPLATES
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _compose_prompt(system_key: str, override: str, style_prompt: str) -> str:
+    """Compose the system prompt preview text shown in the Generate tab.
+
+    All inputs are part of the cache key, so edits to overrides or the style
+    prompt simply produce a new entry and nothing needs invalidating.
+    """
+    prompt_text = override or SYSTEM_PROMPTS.get(system_key, "No system prompt found.")
+    if style_prompt:
+        style_prefix = TEMPLATES.get("style_prefix", "Style: {style_prompt}")
+        prompt_text += "\n\n" + style_prefix.format(style_prompt=style_prompt)
+    return prompt_text
+
+
 def build_generate_tab():
     """Build the Generate tab content with unified creation interface."""
     with ui.column().classes("w-full gap-4 p-4"):
@@ -96,9 +118,21 @@ def build_generate_tab():
         # Rework source selection (only visible in Rework mode)
         rework_section = ui.column().classes("w-full")
         rework_source_path: list[Optional[Path]] = [None]
+        rework_cards: dict[Path, ui.card] = {}
+
+        def select_rework(path: Path) -> None:
+            # Restyle only the old and new selection instead of rebuilding the grid
+            previous = rework_source_path[0]
+            if previous in rework_cards:
+                rework_cards[previous].style("border: 2px solid transparent;")
+            rework_source_path[0] = path
+            APP.session_state["selected_rework_image"] = path
+            if path in rework_cards:
+                rework_cards[path].style("border: 2px solid #10b981;")
 
         def build_rework_source_selector():
             rework_section.clear()
+            rework_cards.clear()
             with rework_section:
                 if not mode_switch.value:
                     return
@@ -128,6 +162,10 @@ def build_generate_tab():
                         )
                         return
 
+                    prepare_thumbnails(
+                        [Path(img["path"]) for img in images if img.get("path")]
+                    )
+
                     rework_grid = ui.element("div").classes("grid grid-cols-4 gap-2")
 
                     with rework_grid:
@@ -139,32 +177,9 @@ def build_generate_tab():
 
                             if img_path:
                                 full_path = Path(img_path)
-                                if not full_path.is_absolute():
-                                    full_path = APP.settings.working_folder / img_path
-
-                                thumb_path = None
-                                if APP.image_service:
-                                    try:
-                                        thumb_path = APP.image_service.ensure_thumbnail(
-                                            full_path
-                                        )
-                                    except Exception as e:
-                                        logger.warning(
-                                            f"Failed to ensure thumbnail for {full_path}: {e}"
-                                        )
-
-                                if not thumb_path:
-                                    thumb_path = (
-                                        APP.settings.working_folder
-                                        / ".thumbnails"
-                                        / f"{full_path.stem}_thumb.png"
-                                    )
-
-                                display_path = (
-                                    thumb_path if thumb_path.exists() else full_path
-                                )
 
-                                if display_path.exists():
+                                display_path = get_display_path(full_path)
+                                if display_path:
                                     is_selected = rework_source_path[0] == full_path
 
                                     with ui.card().classes(
@@ -178,25 +193,29 @@ def build_generate_tab():
                                         with ui.element("div").classes(
                                             "w-full h-20 bg-gray-100 flex items-center justify-center rounded"
                                         ):
-                                            ui.image(str(display_path)).props(
-                                                "fit=contain"
-                                            ).classes("w-full h-full")
+                                            thumbnail_image(
+                                                full_path, display_path
+                                            ).props("fit=contain").classes(
+                                                "w-full h-full"
+                                            )
                                         ui.label(img_name[:15]).classes(
                                             "text-xs truncate text-center"
                                         )
 
-                                        def select_rework(card=card, path=full_path):
-                                            rework_source_path[0] = path
-                                            APP.session_state[
-                                                "selected_rework_image"
-                                            ] = path
-                                            build_rework_source_selector()
-
-                                        card.on("click", select_rework)
+                                        rework_cards[full_path] = card
+                                        card.on(
+                                            "click", partial(select_rework, full_path)
+                                        )
 
         # Reference selection state
-        selected_references: dict[str, bool] = dict(
-            APP.session_state.get("selected_references", {})
+        # Shared with session_state and mutated in place, so toggles persist
+        # across tab rebuilds without copying the dict.
+        selected_references: dict[str, bool] = APP.session_state.setdefault(
+            "selected_references", {}
+        )
+        # Full paths of the selected references, kept in sync by toggle/remove
+        selected_paths: dict[str, Path] = APP.session_state.setdefault(
+            "selected_paths", {}
         )
 
         # Prompt input
@@ -260,9 +279,10 @@ def build_generate_tab():
 
             def remove_ref(rid):
                 selected_references[rid] = False
-                APP.session_state["selected_references"] = selected_references
+                selected_paths.pop(rid, None)
                 update_selected_refs_display()
-                build_refs_grid()
+                if rid in ref_cards:
+                    ref_cards[rid].style("border: 2px solid transparent;")
 
         # Reference selection
         with ui.card().classes("w-full"):
@@ -273,9 +293,53 @@ def build_generate_tab():
                     show_pages = ui.switch("Show pages", value=False).props("dense")
 
             refs_grid = ui.element("div").classes("w-full")
+            refs_visible_count = [GRID_PAGE_SIZE]
+            refs_grid_signature: list[Optional[tuple]] = [None]
+            ref_cards: dict[str, ui.card] = {}
+
+            def show_more_refs():
+                refs_visible_count[0] += GRID_PAGE_SIZE
+                build_refs_grid()
+
+            def toggle_ref(card: ui.card, rid: str, path: Path) -> None:
+                selected = not selected_references.get(rid, False)
+                selected_references[rid] = selected
+                if selected:
+                    selected_paths[rid] = path
+                else:
+                    selected_paths.pop(rid, None)
+                card.style(
+                    "border: 2px solid #6366f1;"
+                    if selected
+                    else "border: 2px solid transparent;"
+                )
+                update_selected_refs_display()
+
+            def build_refs_grid(force: bool = False):
+                # Show references, inputs, and pages
+                all_refs = []
+                if APP.project_manager and APP.settings:
+                    all_refs = APP.project_manager.get_images("references")
+                    if show_inputs.value:
+                        all_refs.extend(APP.project_manager.get_images("inputs"))
+                    if show_pages.value:
+                        all_refs.extend(APP.project_manager.get_images("pages"))
+
+                # Refresh callbacks fire on any folder change, so skip the
+                # rebuild when neither the listing nor the filters changed.
+                signature = (
+                    str(APP.settings.working_folder) if APP.settings else None,
+                    show_inputs.value,
+                    show_pages.value,
+                    refs_visible_count[0],
+                    tuple(ref.get("id") for ref in all_refs),
+                )
+                if not force and signature == refs_grid_signature[0]:
+                    return
+                refs_grid_signature[0] = signature
 
-            def build_refs_grid():
                 refs_grid.clear()
+                ref_cards.clear()
                 with refs_grid:
                     if not APP.project_manager or not APP.settings:
                         ui.label("Configure settings first.").classes(
@@ -283,23 +347,19 @@ def build_generate_tab():
                         )
                         return
 
-                    # Show references, inputs, and pages
-                    all_refs = APP.project_manager.get_images("references")
-
-                    if show_inputs.value:
-                        all_refs.extend(APP.project_manager.get_images("inputs"))
-
-                    if show_pages.value:
-                        all_refs.extend(APP.project_manager.get_images("pages"))
-
                     if not all_refs:
                         ui.label("No images available.").classes(
                             "text-gray-500 text-sm"
                         )
                         return
 
+                    visible_refs = all_refs[: refs_visible_count[0]]
+                    prepare_thumbnails(
+                        [Path(ref["path"]) for ref in visible_refs if ref.get("path")]
+                    )
+
                     with ui.element("div").classes("grid grid-cols-6 gap-2 mt-2"):
-                        for ref in all_refs:
+                        for ref in visible_refs:
                             ref_id = ref.get("id")
                             ref_path = ref.get("path")
                             ref_name = ref.get(
@@ -308,32 +368,9 @@ def build_generate_tab():
 
                             if ref_path:
                                 full_path = Path(ref_path)
-                                if not full_path.is_absolute():
-                                    full_path = APP.settings.working_folder / full_path
-
-                                thumb_path = None
-                                if APP.image_service:
-                                    try:
-                                        thumb_path = APP.image_service.ensure_thumbnail(
-                                            full_path
-                                        )
-                                    except Exception as e:
-                                        logger.warning(
-                                            f"Failed to ensure thumbnail for {full_path}: {e}"
-                                        )
-
-                                if not thumb_path:
-                                    thumb_path = (
-                                        APP.settings.working_folder
-                                        / ".thumbnails"
-                                        / f"{full_path.stem}_thumb.png"
-                                    )
 
-                                display_path = (
-                                    thumb_path if thumb_path.exists() else full_path
-                                )
-
-                                if display_path.exists():
+                                display_path = get_display_path(full_path)
+                                if display_path:
                                     if ref_id not in selected_references:
                                         selected_references[ref_id] = False
 
@@ -348,36 +385,34 @@ def build_generate_tab():
                                         with ui.element("div").classes(
                                             "w-full h-16 bg-gray-100 flex items-center justify-center rounded"
                                         ):
-                                            ui.image(str(display_path)).props(
-                                                "fit=contain"
-                                            ).classes("w-full h-full")
+                                            thumbnail_image(
+                                                full_path, display_path
+                                            ).props("fit=contain").classes(
+                                                "w-full h-full"
+                                            )
                                         ui.label(ref_name[:10]).classes(
                                             "text-xs truncate text-center"
                                         )
 
-                                        def toggle_ref(card=card, rid=ref_id):
-                                            selected_references[
-                                                rid
-                                            ] = not selected_references.get(rid, False)
-                                            APP.session_state["selected_references"] = (
-                                                selected_references
-                                            )
-                                            if selected_references[rid]:
-                                                card.style("border: 2px solid #6366f1;")
-                                            else:
-                                                card.style(
-                                                    "border: 2px solid transparent;"
-                                                )
-                                            update_selected_refs_display()
+                                        ref_cards[ref_id] = card
+                                        card.on(
+                                            "click",
+                                            partial(
+                                                toggle_ref, card, ref_id, full_path
+                                            ),
+                                        )
 
-                                        card.on("click", toggle_ref)
+                    remaining = len(all_refs) - len(visible_refs)
+                    if remaining > 0:
+                        ui.button(
+                            f"Show more ({remaining} remaining)",
+                            on_click=show_more_refs,
+                        ).props("flat dense").classes("mt-2")
 
-            build_refs_grid()
-            update_selected_refs_display()
             show_inputs.on("update:model-value", build_refs_grid)
             show_pages.on("update:model-value", build_refs_grid)
 
-            ui.button("↻ Refresh", on_click=build_refs_grid).props(
+            ui.button("↻ Refresh", on_click=partial(build_refs_grid, force=True)).props(
                 "flat dense"
             ).classes("mt-2")
 
@@ -419,73 +454,51 @@ def build_generate_tab():
                     else:
                         aspect_ratio = APP.settings.aspect_ratio
 
-                # Collect selected references
-                reference_images = []
-                if APP.project_manager and APP.settings:
-                    # Check all image categories for selected references
-                    for cat in ["references", "inputs", "pages"]:
-                        images = APP.project_manager.get_images(cat)
-                        for img in images:
-                            if selected_references.get(img.get("id"), False):
-                                img_path = img.get("path")
-                                if img_path:
-                                    full_path = Path(img_path)
-                                    if not full_path.is_absolute():
-                                        full_path = (
-                                            APP.settings.working_folder / full_path
-                                        )
-                                    if full_path.exists():
-                                        reference_images.append(full_path)
+                # Drop selections whose files were deleted or that belong to
+                # a previous working folder (the selection lives in
+                # session_state and survives folder switches). The folder
+                # watcher's index can lag behind files saved moments ago, so
+                # check the files themselves.
+                working_folder = APP.settings.working_folder if APP.settings else None
+                root = working_folder.resolve() if working_folder else None
+                stale = [
+                    rid
+                    for rid, p in selected_paths.items()
+                    if not Path(p).exists()
+                    or (root is not None and not Path(p).resolve().is_relative_to(root))
+                ]
+                for rid in stale:
+                    selected_paths.pop(rid)
+                    selected_references[rid] = False
+                if stale:
+                    update_selected_refs_display()
+                    ui.notify(
+                        f"{len(stale)} selected image(s) are no longer in the "
+                        "working folder and were removed from the selection",
+                        type="warning",
+                    )
+                reference_images = list(selected_paths.values()) or None
+
+                # Parameters shared by both service calls, read once per click
+                common = dict(
+                    prompt=prompt,
+                    style_prompt=APP.settings.style_prompt if APP.settings else "",
+                    aspect_ratio=aspect_ratio,
+                    image_size=resolution,
+                    category=category,
+                    p_threshold=p_threshold_input.value,
+                    temperature=temperature_input.value,
+                )
 
                 try:
                     if mode == "Create":
-                        # Create new image
-                        ui.notify(f"Generating {gen_type.lower()}...", type="info")
-
-                        if APP.status_footer:
-                            async with APP.status_footer.busy(
-                                f"Generating {gen_type.lower()}..."
-                            ) as token:
-                                (
-                                    image_path,
-                                    thumb_path,
-                                ) = await APP.image_service.generate_image(
-                                    prompt=prompt,
-                                    reference_images=reference_images
-                                    if reference_images
-                                    else None,
-                                    style_prompt=APP.settings.style_prompt
-                                    if APP.settings
-                                    else "",
-                                    aspect_ratio=aspect_ratio,
-                                    image_size=resolution,
-                                    category=category,
-                                    system_prompt_key=system_key,
-                                    p_threshold=p_threshold_input.value,
-                                    temperature=temperature_input.value,
-                                    progress_callback=lambda m: APP.status_footer.update(
-                                        m, token=token
-                                    ),
-                                )
-                        else:
-                            (
-                                image_path,
-                                thumb_path,
-                            ) = await APP.image_service.generate_image(
-                                prompt=prompt,
-                                reference_images=reference_images
-                                if reference_images
-                                else None,
-                                style_prompt=APP.settings.style_prompt
-                                if APP.settings
-                                else "",
-                                aspect_ratio=aspect_ratio,
-                                image_size=resolution,
-                                category=category,
-                                system_prompt_key=system_key,
-                                p_threshold=p_threshold_input.value,
-                                temperature=temperature_input.value,
-                            )
+                        run = partial(
+                            APP.image_service.generate_image,
+                            reference_images=reference_images,
+                            system_prompt_key=system_key,
+                            **common,
+                        )
+                        message = f"Generating {gen_type.lower()}..."
                     else:
                         # Rework existing image
                         if not rework_source_path[0]:
@@ -494,52 +507,25 @@ def build_generate_tab():
                             )
                             return
 
-                        ui.notify(f"Reworking {gen_type.lower()}...", type="info")
-
-                        if APP.status_footer:
-                            async with APP.status_footer.busy(
-                                f"Reworking {gen_type.lower()}..."
-                            ) as token:
-                                (
-                                    image_path,
-                                    thumb_path,
-                                ) = await APP.image_service.rework_image(
-                                    original_image=rework_source_path[0],
-                                    prompt=prompt,
-                                    additional_references=reference_images
-                                    if reference_images
-                                    else None,
-                                    style_prompt=APP.settings.style_prompt
-                                    if APP.settings
-                                    else "",
-                                    aspect_ratio=aspect_ratio,
-                                    image_size=resolution,
-                                    category=category,
-                                    p_threshold=p_threshold_input.value,
-                                    temperature=temperature_input.value,
-                                    progress_callback=lambda m: APP.status_footer.update(
-                                        m, token=token
-                                    ),
+                        run = partial(
+                            APP.image_service.rework_image,
+                            original_image=rework_source_path[0],
+                            additional_references=reference_images,
+                            **common,
+                        )
+                        message = f"Reworking {gen_type.lower()}..."
+
+                    ui.notify(message, type="info")
+
+                    if APP.status_footer:
+                        async with APP.status_footer.busy(message) as token:
+                            image_path, thumb_path = await run(
+                                progress_callback=lambda m: APP.status_footer.update(
+                                    m, token=token
                                 )
-                        else:
-                            (
-                                image_path,
-                                thumb_path,
-                            ) = await APP.image_service.rework_image(
-                                original_image=rework_source_path[0],
-                                prompt=prompt,
-                                additional_references=reference_images
-                                if reference_images
-                                else None,
-                                style_prompt=APP.settings.style_prompt
-                                if APP.settings
-                                else "",
-                                aspect_ratio=aspect_ratio,
-                                image_size=resolution,
-                                category=category,
-                                p_threshold=p_threshold_input.value,
-                                temperature=temperature_input.value,
                             )
+                    else:
+                        image_path, thumb_path = await run()
 
                     ui.notify(f"{gen_type} created: {image_path.name}", type="positive")
 
@@ -568,27 +554,16 @@ def build_generate_tab():
             if mode_switch.value:
                 system_key = "rework_page" if gen_type == "Page" else "rework_character"
 
-            # Check for project-specific override first, then fall back to default
+            # Project-specific override first, then the default, plus style
+            override = ""
+            style_prompt = ""
             if APP.settings:
-                override = APP.settings.get_system_prompt_override(system_key)
-                if override:
-                    prompt_text = override
-                else:
-                    prompt_text = SYSTEM_PROMPTS.get(
-                        system_key, "No system prompt found."
-                    )
-            else:
-                prompt_text = SYSTEM_PROMPTS.get(system_key, "No system prompt found.")
-
-            # Add style prompt to display
-            if APP.settings and APP.settings.style_prompt:
-                style_prefix = TEMPLATES.get("style_prefix", "Style: {style_prompt}")
-                formatted_style = style_prefix.format(
-                    style_prompt=APP.settings.style_prompt
-                )
-                prompt_text += "\n\n" + formatted_style
+                override = APP.settings.get_system_prompt_override(system_key) or ""
+                style_prompt = APP.settings.style_prompt or ""
 
-            system_prompt_display.text = prompt_text
+            system_prompt_display.text = _compose_prompt(
+                system_key, override, style_prompt
+            )
 
         def on_mode_change():
             APP.session_state["generate_mode"] = (
@@ -621,13 +596,19 @@ def build_generate_tab():
         mode_switch.on("update:model-value", on_mode_change)
         type_switch.on("update:model-value", on_type_change)
         resolution_select.on("update:model-value", on_resolution_change)
-        p_threshold_input.on("change", on_p_threshold_change)
-        temperature_input.on("change", on_temperature_change)
+        p_threshold_input.on("change", debounce(on_p_threshold_change))
+        temperature_input.on("change", debounce(on_temperature_change))
 
-        # Initial build of rework section
-        build_rework_source_selector()
         update_system_prompt_display()
 
-        # Register refresh callbacks
-        APP.register_refresh_callback(build_rework_source_selector)
-        APP.register_refresh_callback(build_refs_grid)
+        # Thumbnail grids are only built once the tab is opened
+        def build_grids():
+            build_rework_source_selector()
+            build_refs_grid()
+            update_selected_refs_display()
+
+            # Register refresh callbacks
+            APP.register_refresh_callback(build_rework_source_selector)
+            APP.register_refresh_callback(build_refs_grid)
+
+        APP.defer_until_tab_shown("Generate", build_grids)
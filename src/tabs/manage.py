@@ -30,8 +30,12 @@ def build_manage_tab():
                             initial_tab=current_tab,
                         )
 
-            init_manager()
-            APP.register_refresh_callback(init_manager)
+            def build_manager():
+                init_manager()
+                APP.register_refresh_callback(init_manager)
+
+            # Building the manager thumbnails all images, so wait for the tab
+            APP.defer_until_tab_shown("Manage", build_manager)
             with ui.row().classes("gap-2"):
                 ui.button("Refresh", on_click=init_manager, icon="refresh").props(
                     "outline"
@@ -104,6 +104,11 @@ def build_settings_tab():
                         APP.settings.working_folder = folder_path
                         APP.ensure_logging()
 
+                        # Selections point into the old folder; clear them in
+                        # place, the Generate tab holds the same dicts.
+                        APP.session_state["selected_references"].clear()
+                        APP.session_state["selected_paths"].clear()
+
                         # Re-initialize services with new folder and restart folder watcher
                         init_image_service()
                         start_folder_watcher()
@@ -161,6 +166,39 @@ def build_settings_tab():
                 )
                 style_textarea._props["marker"] = "style-prompt-input"
 
+            # Generation
+            with ui.card().classes("w-full"):
+                ui.label("Generation").classes("text-lg font-bold")
+
+                reuse_switch = ui.switch(
+                    "Reuse results of identical requests",
+                    value=APP.settings.reuse_identical_generations
+                    if APP.settings
+                    else False,
+                )
+                reuse_switch._props["marker"] = "reuse-generations-switch"
+                ui.label(
+                    "Repeating a request with the same prompt, settings and "
+                    "images returns the earlier result instead of calling "
+                    "the API again. Turn off to get a new variation every time."
+                ).classes("text-gray-600 text-sm")
+
+                concurrency_input = ui.number(
+                    "Concurrent generations",
+                    value=APP.settings.max_concurrent_generations
+                    if APP.settings
+                    else 4,
+                    min=1,
+                    max=8,
+                    step=1,
+                    precision=0,
+                ).classes("w-64 mt-4")
+                concurrency_input._props["marker"] = "concurrent-generations-input"
+                ui.label(
+                    "How many images may be generated at the same time. Each "
+                    "running generation is a separate, billed API request."
+                ).classes("text-gray-600 text-sm")
+
             # System Prompt Overrides (project-specific)
             with ui.card().classes("w-full"):
                 ui.label("System Prompt Overrides").classes("text-lg font-bold")
@@ -283,6 +321,12 @@ def build_settings_tab():
             if style_textarea.value != APP.settings.style_prompt:
                 return True
 
+            # Generation
+            if reuse_switch.value != APP.settings.reuse_identical_generations:
+                return True
+            if concurrency_input.value != APP.settings.max_concurrent_generations:
+                return True
+
             # System Prompt Overrides
             for key, textarea in [
                 ("character_sheet", char_sheet_textarea),
@@ -309,6 +353,11 @@ def build_settings_tab():
                     APP.settings.aspect_ratio = aspect_select.value
                     APP.settings.character_sheet_aspect_ratio = char_aspect_select.value
                     APP.settings.style_prompt = style_textarea.value
+                    APP.settings.reuse_identical_generations = reuse_switch.value
+                    if concurrency_input.value is not None:
+                        APP.settings.max_concurrent_generations = min(
+                            8, max(1, int(concurrency_input.value))
+                        )
 
                     # Save system prompt overrides
                     for key, textarea in [
@@ -1,8 +1,10 @@
 import logging
+import asyncio
 from datetime import datetime
+from functools import partial
 from nicegui import ui
 from src.app import APP
-from src._utils import notify_error
+from src._utils import check_folder_changes, notify_error
 from src.components.sketch_canvas import SketchCanvas, save_sketch_to_file
 
 logger = logging.getLogger(__name__)
@@ -35,24 +37,31 @@ def build_sketch_tab():
                     return
 
                 try:
+                    loop = asyncio.get_running_loop()
+
                     # Save to references folder
                     refs_folder = APP.settings.working_folder / "references"
-                    refs_folder.mkdir(parents=True, exist_ok=True)
+                    await loop.run_in_executor(
+                        None, partial(refs_folder.mkdir, parents=True, exist_ok=True)
+                    )
 
                     name = filename_input.value or "sketch"
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"{name}_{timestamp}.png"
                     file_path = refs_folder / filename
 
-                    save_sketch_to_file(data_url, file_path)
+                    # Decoding and writing a large sketch would block the UI
+                    await loop.run_in_executor(
+                        None, save_sketch_to_file, data_url, file_path
+                    )
 
                     # No need to call add_image as we saved directly to the folder
                     # and add_image would create a duplicate
 
                     ui.notify(f"Sketch saved: {filename}", type="positive")
 
-                    # Refresh other tabs if needed
-                    APP.trigger_refresh()
+                    # Refresh other tabs and the watcher's file index
+                    check_folder_changes()
 
                 except Exception as e:
                     logger.exception("Failed to save sketch")
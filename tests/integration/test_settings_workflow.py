@@ -24,6 +24,8 @@ def mock_services(mock_keyring, temp_dir):
         settings_instance.working_folder = temp_dir
         settings_instance.aspect_ratio = "3:4"
         settings_instance.style_prompt = ""
+        settings_instance.reuse_identical_generations = False
+        settings_instance.max_concurrent_generations = 4
 
         MockSettings.return_value = settings_instance
 
@@ -87,6 +89,13 @@ class TestSettingsWorkflow:
         # Should see character sheet aspect ratio options
         await user.should_see("Character Sheet Aspect Ratio")
 
+    async def test_generation_settings_shown(self, user: User, mock_services):
+        """Test that the generation controls are shown."""
+        await user.open("/")
+
+        await user.should_see("Reuse results of identical requests")
+        await user.should_see("Concurrent generations")
+
     async def test_settings_validation_empty_key(self, user: User, mock_services):
         """Test validation when trying to save empty API key."""
         mock_services.get_api_key.return_value = ""
@@ -4,6 +4,7 @@ Tests the vertical tab layout and ensure state is preserved when switching tabs.
 """
 
 import pytest
+from nicegui import ui
 from nicegui.testing import User
 
 
@@ -70,6 +71,41 @@ class TestTabNavigation:
         await user.should_see("Prompt")
         await user.should_see("Select References")
 
+    async def test_generate_grid_built_on_first_open(self, user: User):
+        """Test that the Generate reference grid is only built once opened."""
+        await user.open("/")
+
+        await user.should_see("Generate")
+        await user.should_not_see("Configure settings first.")
+
+        user.find(content="Generate").click()
+        await user.should_see("Configure settings first.")
+
+    async def test_generate_grid_skips_unchanged_refresh(self, user: User):
+        """Test that a refresh with unchanged inputs keeps the existing grid."""
+        from src.app import APP
+
+        await user.open("/")
+        await user.should_see("Generate")
+        user.find(content="Generate").click()
+        await user.should_see("Configure settings first.")
+
+        before = user.find(content="Configure settings first.").elements
+        APP.trigger_refresh()
+        after = user.find(content="Configure settings first.").elements
+
+        assert after == before
+
+    async def test_rework_toggle_shows_source_selector(self, user: User):
+        """Test that switching to Rework mode shows the rework source picker."""
+        await user.open("/")
+        await user.should_see("Generate")
+        user.find(content="Generate").click()
+        await user.should_not_see("Select Image to Rework")
+
+        user.find(content="Rework Mode", kind=ui.switch).click()
+        await user.should_see("Select Image to Rework")
+
     async def test_switch_to_manage_tab(self, user: User):
         """Test switching to the Manage tab."""
         await user.open("/")
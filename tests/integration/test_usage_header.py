@@ -50,3 +50,18 @@ async def test_header_has_reset_button(user: User, mock_settings_with_usage):
     await user.open("/")
     # Material icons are often rendered as text ligatures
     await user.should_see("restart_alt")
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_header_updates_when_usage_recorded(user: User, mock_settings_with_usage):
+    from src.app import APP
+
+    await user.open("/")
+    await user.should_see("Tokens:")
+
+    usage = mock_settings_with_usage.get_gemini_usage.return_value
+    usage["totals"]["total_tokens"] = 1234
+    with patch.object(APP, "settings", mock_settings_with_usage):
+        APP.notify_usage_changed()
+        await user.should_see("Tokens: 1234")
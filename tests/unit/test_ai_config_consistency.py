@@ -6,12 +6,19 @@ Ensures ai_config.json exists and contains all required keys.
 from __future__ import annotations
 
 import json
+import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from src.services.ai_config import load_ai_config, AIConfigError
+from src.services.ai_config import (
+    load_ai_config,
+    get_system_prompts,
+    get_templates,
+    AIConfigError,
+)
 
 
 REQUIRED_MODELS = ["image_generation"]
@@ -71,3 +78,45 @@ def test_load_ai_config_raises_on_invalid_json() -> None:
         bad_json.write_text("{ not valid json }", encoding="utf-8")
         with pytest.raises(AIConfigError, match="Invalid JSON"):
             load_ai_config(bad_json)
+
+
+@pytest.mark.unit
+def test_load_ai_config_reuses_parsed_file_until_modified() -> None:
+    """Verify the config is parsed once and reloaded after the file changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "ai_config.json"
+        config_path.write_text('{"models": {"a": "one"}}', encoding="utf-8")
+
+        first = load_ai_config(config_path)
+        assert load_ai_config(config_path) is first
+        # Callers share the cached config, so it cannot be modified.
+        with pytest.raises(TypeError):
+            first["models"]["a"] = "changed"  # type: ignore[index]
+
+        config_path.write_text('{"models": {"a": "two"}}', encoding="utf-8")
+        mtime_ns = config_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(config_path, ns=(mtime_ns, mtime_ns))
+
+        assert load_ai_config(config_path)["models"]["a"] == "two"
+
+
+@pytest.mark.unit
+def test_prompt_sections_are_read_only_and_reused() -> None:
+    """Verify prompt/template sections are shared read-only views."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = Path(tmpdir) / "ai_config.json"
+        config_path.write_text(
+            '{"system_prompts": {"page": "Draw", "bad": 1}, "templates": {}}',
+            encoding="utf-8",
+        )
+        with patch.dict(os.environ, {"BuchJa_AI_CONFIG": str(config_path)}):
+            prompts = get_system_prompts()
+            assert dict(prompts) == {"page": "Draw"}
+            assert get_system_prompts() is prompts
+            with pytest.raises(TypeError):
+                prompts["page"] = "Paint"  # type: ignore[index]
+            assert dict(get_templates()) == {}
+
+        # An explicitly passed config gets its own view of the same values.
+        cfg = load_ai_config(config_path)
+        assert dict(get_system_prompts(config=cfg)) == {"page": "Draw"}
@@ -0,0 +1,38 @@
+"""Unit tests for the shared file system helpers."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from PIL import Image
+
+from src.services.fs_utils import stat_files
+
+
+@pytest.mark.unit
+class TestStatFiles:
+    """Tests for stat_files."""
+
+    def test_returns_existing_files_only(self, temp_dir: Path):
+        """Test that missing files and folders are left out."""
+        image = temp_dir / "a.png"
+        Image.new("RGB", (10, 10)).save(image)
+        (temp_dir / "sub").mkdir()
+
+        stats = stat_files(
+            [image, temp_dir / "missing.png", temp_dir / "sub", Path("/no/dir/x.png")]
+        )
+
+        assert list(stats) == [image]
+        assert stats[image].st_size == image.stat().st_size
+
+    def test_ignores_case_where_file_system_does(self, temp_dir: Path):
+        """Test that a differently cased path counts as existing on Windows."""
+        image = temp_dir / "a.png"
+        Image.new("RGB", (10, 10)).save(image)
+        upper = image.with_name("A.PNG")
+
+        # Simulate Windows' case-insensitive os.path.normcase
+        with patch("os.path.normcase", str.lower):
+            stats = stat_files([upper, image])
+
+        assert set(stats) == {upper, image}
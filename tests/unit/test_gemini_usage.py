@@ -51,3 +51,45 @@ def test_extract_gemini_usage_empty_when_no_metadata():
     assert result.output_tokens is None
     assert result.total_tokens is None
     assert result.cost is None
+
+
+@pytest.mark.unit
+def test_extract_gemini_usage_from_sdk_response_metadata():
+    from google.genai import types
+
+    obj = SimpleNamespace(
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=5,
+            candidates_token_count=7,
+            total_token_count=12,
+            candidates_tokens_details=[
+                types.ModalityTokenCount(modality="IMAGE", token_count=7)
+            ],
+        )
+    )
+
+    result = extract_gemini_usage(obj)
+
+    assert result.prompt_tokens == 5
+    assert result.output_tokens == 7
+    assert result.total_tokens == 12
+    assert result.output_image_tokens == 7
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "modality, expected",
+    [
+        ("TEXT", "text"),
+        ("MODALITY_IMAGE", "image"),
+        (SimpleNamespace(name="IMAGE"), "image"),
+        ("AUDIO", None),
+        (None, None),
+    ],
+)
+def test_modality_key_normalizes_sdk_values(modality, expected):
+    from src.services.gemini_usage import _modality_key
+
+    assert _modality_key(modality) == expected
+    # Second lookup is served from the cache
+    assert _modality_key(modality) == expected
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 from src.components.image_manager import ProjectManager
 
@@ -25,7 +27,7 @@ class TestProjectManager:
 
         # Create a thumbnail for the target file
         target_stem = target_path.stem
-        thumb_path = tmp_path / ".thumbnails" / f"{target_stem}_thumb.png"
+        thumb_path = tmp_path / ".thumbnails" / f"{target_stem}_thumb.webp"
         thumb_path.touch()
 
         assert thumb_path.exists()
@@ -48,3 +50,25 @@ class TestProjectManager:
 
         # Assert
         assert result is False
+
+    def test_get_images_returns_absolute_paths(self, project_manager, tmp_path):
+        source_file = tmp_path / "source.png"
+        source_file.touch()
+        item = project_manager.add_image(source_file, "pages", "test_image")
+
+        images = project_manager.get_images("pages")
+
+        assert len(images) == 1
+        assert images[0]["id"] == item["id"] == "pages/001_test_image.png"
+        assert images[0]["path"] == item["path"] == str(tmp_path / item["id"])
+
+    def test_get_ordered_page_paths(self, project_manager, tmp_path):
+        for name in ("b", "a"):
+            source_file = tmp_path / f"{name}.png"
+            source_file.touch()
+            project_manager.add_image(source_file, "pages", name)
+
+        paths = project_manager.get_ordered_page_paths()
+
+        assert paths == [Path(p["path"]) for p in project_manager.get_ordered_pages()]
+        assert all(p.is_absolute() for p in paths)
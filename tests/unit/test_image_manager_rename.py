@@ -22,7 +22,7 @@ class TestProjectManagerRename:
 
         # Create a thumbnail
         target_path = tmp_path / image_id
-        thumb_path = tmp_path / ".thumbnails" / f"{target_path.stem}_thumb.png"
+        thumb_path = tmp_path / ".thumbnails" / f"{target_path.stem}_thumb.webp"
         thumb_path.touch()
 
         # Action: Rename
@@ -37,7 +37,7 @@ class TestProjectManagerRename:
 
         # Check new files exist
         new_path = tmp_path / "references" / "renamed_ref.png"
-        new_thumb_path = tmp_path / ".thumbnails" / "renamed_ref_thumb.png"
+        new_thumb_path = tmp_path / ".thumbnails" / "renamed_ref_thumb.webp"
 
         assert new_path.exists()
         assert new_thumb_path.exists()
@@ -55,7 +55,7 @@ class TestProjectManagerRename:
         assert "001_test_page" in image_id
 
         target_path = tmp_path / image_id
-        thumb_path = tmp_path / ".thumbnails" / f"{target_path.stem}_thumb.png"
+        thumb_path = tmp_path / ".thumbnails" / f"{target_path.stem}_thumb.webp"
         thumb_path.touch()
 
         # Action: Rename (providing only the name part)
@@ -70,7 +70,7 @@ class TestProjectManagerRename:
 
         # Check new files exist with prefix
         new_path = tmp_path / "pages" / "001_renamed_page.png"
-        new_thumb_path = tmp_path / ".thumbnails" / "001_renamed_page_thumb.png"
+        new_thumb_path = tmp_path / ".thumbnails" / "001_renamed_page_thumb.webp"
 
         assert new_path.exists()
         assert new_thumb_path.exists()
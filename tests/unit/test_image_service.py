@@ -4,6 +4,7 @@ All tests mock the Gemini API to avoid real API calls and token usage.
 """
 
 import asyncio
+import io
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -12,9 +13,11 @@ from PIL import Image
 from src.services.image_service import (
     ImageService,
     ImageGenerationError,
+    REFERENCE_MAX_EDGE,
     SYSTEM_PROMPTS,
     TEMPLATES,
     THUMBNAIL_SIZE,
+    _sniff_mime,
 )
 
 
@@ -69,16 +72,32 @@ class TestImageService:
             "character_sheet", ""
         )
 
-    def test_get_mime_type(self, working_folder: Path, mock_genai):
-        """Test MIME type detection for various file types."""
-        service = ImageService("test-api-key", working_folder)
-
-        assert service._get_mime_type(Path("test.png")) == "image/png"
-        assert service._get_mime_type(Path("test.jpg")) == "image/jpeg"
-        assert service._get_mime_type(Path("test.jpeg")) == "image/jpeg"
-        assert service._get_mime_type(Path("test.gif")) == "image/gif"
-        # Unknown type defaults to jpeg
-        assert service._get_mime_type(Path("test.xyz")) == "image/jpeg"
+    def test_system_instruction_refreshes_after_override_change(
+        self, working_folder: Path, mock_genai
+    ):
+        """Test that cached system instructions follow override updates."""
+        service = ImageService(
+            "test-api-key", working_folder, system_prompt_overrides={"page": "Old"}
+        )
+        assert service._system_instruction("page", "") == "Old"
+
+        service.set_system_prompt_overrides({"page": "New"})
+
+        assert service._system_instruction("page", "") == "New"
+
+    def test_sniff_mime(self):
+        """Test MIME type detection from image headers."""
+        for fmt, mime_type in (
+            ("PNG", "image/png"),
+            ("JPEG", "image/jpeg"),
+            ("GIF", "image/gif"),
+            ("WEBP", "image/webp"),
+        ):
+            buffer = io.BytesIO()
+            Image.new("RGB", (4, 4)).save(buffer, fmt)
+            assert _sniff_mime(buffer.getvalue()[:12]) == mime_type
+        # Unknown data defaults to jpeg
+        assert _sniff_mime(b"not an image") == "image/jpeg"
 
     def test_create_thumbnail(
         self, working_folder: Path, sample_image: Path, mock_genai
@@ -97,9 +116,10 @@ class TestImageService:
         assert ".thumbnails" in str(thumbnail_path)
         assert "_thumb" in thumbnail_path.name
 
-        # Check thumbnail size
+        # Check thumbnail size and format
         with Image.open(thumbnail_path) as img:
             assert max(img.size) <= THUMBNAIL_SIZE
+            assert img.format == "WEBP"
 
     def test_build_prompt_simple(self, working_folder: Path, mock_genai):
         """Test basic prompt building."""
@@ -285,6 +305,147 @@ class TestImageService:
         # Generations should be serialized (order should be sequential)
         assert generation_order == [0, 1]
 
+    def test_remove_legacy_thumbnails(self, working_folder: Path, mock_genai):
+        """Test that old PNG thumbnails are deleted and WebP ones kept."""
+        service = ImageService("test-api-key", working_folder)
+        thumbnails = working_folder / ".thumbnails"
+        thumbnails.mkdir(exist_ok=True)
+        (thumbnails / "a_thumb.png").touch()
+        (thumbnails / "b_thumb.webp").touch()
+
+        assert service.remove_legacy_thumbnails() == 1
+
+        assert sorted(p.name for p in thumbnails.iterdir()) == ["b_thumb.webp"]
+
+    def test_validate_attachments_keeps_existing_files_in_order(
+        self, working_folder: Path, sample_images: list[Path], mock_genai
+    ):
+        """Test that missing paths and folders are dropped from references."""
+        service = ImageService("test-api-key", working_folder)
+        missing = working_folder / "references" / "missing.png"
+        folder = working_folder / "pages"
+
+        refs, _ = service._validate_attachments(
+            [sample_images[1], missing, folder, sample_images[0]], None
+        )
+
+        assert refs == [sample_images[1], sample_images[0]]
+
+    def test_load_image_as_part_downscales_large_images(
+        self, working_folder: Path, sample_images: list[Path], mock_genai
+    ):
+        """Test that oversized references are downscaled before upload."""
+        service = ImageService("test-api-key", working_folder)
+        large = working_folder / "references" / "large.png"
+        Image.new("RGB", (2048, 1024), color="green").save(large)
+
+        part = service._load_image_as_part(large)
+
+        assert part.inline_data.mime_type == "image/jpeg"
+        with Image.open(io.BytesIO(part.inline_data.data)) as img:
+            assert img.size == (REFERENCE_MAX_EDGE, REFERENCE_MAX_EDGE // 2)
+
+        small = service._load_image_as_part(sample_images[0])
+        assert small.inline_data.data == sample_images[0].read_bytes()
+
+    def test_load_image_as_part_applies_exif_orientation(
+        self, working_folder: Path, mock_genai
+    ):
+        """Test that downscaled photos keep their EXIF rotation."""
+        service = ImageService("test-api-key", working_folder)
+        photo = working_folder / "references" / "photo.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        Image.new("RGB", (2048, 1024), color="green").save(photo, exif=exif)
+
+        part = service._load_image_as_part(photo)
+
+        with Image.open(io.BytesIO(part.inline_data.data)) as img:
+            assert img.size == (REFERENCE_MAX_EDGE // 2, REFERENCE_MAX_EDGE)
+
+    @pytest.mark.asyncio
+    async def test_load_image_parts(
+        self, working_folder: Path, sample_images: list[Path], mock_genai
+    ):
+        """Test that image parts keep their order and mark missing files."""
+        service = ImageService("test-api-key", working_folder)
+        missing = working_folder / "references" / "missing.png"
+
+        parts = await service._load_image_parts(
+            [sample_images[0], missing, sample_images[1]]
+        )
+
+        assert len(parts) == 3
+        assert parts[0] is not None
+        assert parts[1] is None
+        assert parts[2] is not None
+
+    @pytest.mark.asyncio
+    async def test_generate_image_concurrent_requests(
+        self, working_folder: Path, mock_genai
+    ):
+        """Test that requests overlap up to the configured limit."""
+        service = ImageService(
+            "test-api-key", working_folder, max_concurrent_requests=2
+        )
+
+        in_flight = []
+        peak = []
+        original_call_api = service._call_api
+
+        def tracked_call_api(*args, **kwargs):
+            import time
+
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            time.sleep(0.05)
+            in_flight.pop()
+            return original_call_api(*args, **kwargs)
+
+        service._call_api = tracked_call_api
+
+        results = await asyncio.gather(
+            service.generate_image("Prompt 1", category="pages"),
+            service.generate_image("Prompt 2", category="pages"),
+        )
+
+        assert max(peak) == 2
+        # Same-second results must not overwrite each other
+        assert results[0][0] != results[1][0]
+        assert all(image_path.exists() for image_path, _ in results)
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_reuse_cached_result(
+        self, working_folder: Path, mock_genai
+    ):
+        """Test that the result cache serves repeated identical requests."""
+        service = ImageService(
+            "test-api-key", working_folder, reuse_identical_results=True
+        )
+        stream = mock_genai.Client.return_value.models.generate_content_stream
+
+        first, _ = await service.generate_image("Same prompt", category="pages")
+        second, _ = await service.generate_image("Same prompt", category="pages")
+        await service.generate_image("Other prompt", category="pages")
+
+        assert stream.call_count == 2
+        assert second != first
+        assert second.read_bytes() == first.read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_call_api_by_default(
+        self, working_folder: Path, mock_genai
+    ):
+        """Test that repeated requests generate anew unless caching is enabled."""
+        service = ImageService("test-api-key", working_folder)
+        stream = mock_genai.Client.return_value.models.generate_content_stream
+
+        await service.generate_image("Same prompt", category="pages")
+        await service.generate_image("Same prompt", category="pages")
+
+        assert stream.call_count == 2
+        assert not (working_folder / ".generation_cache").exists()
+
     @pytest.mark.asyncio
     async def test_generate_character_sheet(self, working_folder: Path, mock_genai):
         """Test character sheet generation."""
@@ -332,6 +493,39 @@ class TestImageService:
 
         assert thumb_path.exists()
 
+    @pytest.mark.asyncio
+    async def test_ensure_thumbnails_batch(
+        self, working_folder: Path, sample_image: Path, mock_genai
+    ):
+        """Test that ensure_thumbnails creates missing thumbnails for a batch."""
+        import shutil
+
+        images = []
+        for i in range(3):
+            test_image = working_folder / "pages" / f"batch_{i}.png"
+            shutil.copy(sample_image, test_image)
+            images.append(test_image)
+        missing = working_folder / "pages" / "missing.png"
+
+        service = ImageService("test-api-key", working_folder)
+        thumbnails = await service.ensure_thumbnails(images + [missing])
+
+        assert set(thumbnails) == set(images)
+        for thumb_path in thumbnails.values():
+            assert thumb_path.exists()
+
+    def test_create_thumbnail_rgba_converted(self, working_folder: Path, mock_genai):
+        """Test that RGBA sources produce RGB thumbnails."""
+        test_image = working_folder / "pages" / "alpha.png"
+        Image.new("RGBA", (600, 300), color=(255, 0, 0, 128)).save(test_image)
+
+        service = ImageService("test-api-key", working_folder)
+        thumbnail_path = service._create_thumbnail(test_image)
+
+        with Image.open(thumbnail_path) as thumb:
+            assert thumb.mode == "RGB"
+            assert thumb.size == (THUMBNAIL_SIZE, THUMBNAIL_SIZE // 2)
+
     def test_is_generating_flag(self, working_folder: Path, mock_genai):
         """Test that is_generating flag is set during generation."""
         service = ImageService("test-api-key", working_folder)
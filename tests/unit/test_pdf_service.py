@@ -2,9 +2,16 @@
 
 import pytest
 from pathlib import Path
+from unittest.mock import patch
 from PIL import Image
 
-from src.services.pdf_service import PdfService, PdfExportError, ASPECT_RATIO_SIZES
+from src.services.pdf_service import (
+    PdfService,
+    PdfExportError,
+    ASPECT_RATIO_SIZES,
+    PRINT_DPI,
+    _image_size,
+)
 
 
 @pytest.mark.unit
@@ -49,6 +56,20 @@ class TestPdfService:
         assert width == 100
         assert height == 100
 
+    def test_get_image_dimensions_cached_until_file_changes(self, temp_dir: Path):
+        """Test that image sizes are re-read only after the file changes."""
+        service = PdfService()
+        image_path = temp_dir / "cached.png"
+        Image.new("RGB", (40, 30)).save(image_path)
+
+        assert service._get_image_dimensions(image_path) == (40, 30)
+        hits = _image_size.cache_info().hits
+        assert service._get_image_dimensions(image_path) == (40, 30)
+        assert _image_size.cache_info().hits == hits + 1
+
+        Image.new("RGB", (50, 20)).save(image_path)
+        assert service._get_image_dimensions(image_path) == (50, 20)
+
     def test_create_pdf_single_page(self, working_folder: Path, sample_image: Path):
         """Test creating PDF with single page."""
         service = PdfService()
@@ -284,3 +305,57 @@ class TestPdfServiceImageHandling:
         service.create_pdf(page_images=images, output_path=output_path)
 
         assert output_path.exists()
+
+    def test_create_pdf_reuses_source_for_repeated_pages(
+        self, working_folder: Path, sample_image: Path
+    ):
+        """Test that an image used on several pages is prepared only once."""
+        service = PdfService()
+        output_path = working_folder / "exports" / "repeated.pdf"
+
+        with patch.object(
+            service, "_get_page_source", wraps=service._get_page_source
+        ) as get_source:
+            service.create_pdf(
+                page_images=[sample_image, sample_image, sample_image],
+                output_path=output_path,
+            )
+
+        assert get_source.call_count == 1
+        assert output_path.exists()
+
+    def test_get_page_source_downsamples_oversized_images(self, temp_dir: Path):
+        """Test that only images above the print resolution are resampled."""
+        service = PdfService()
+        page_width, page_height = ASPECT_RATIO_SIZES["1:1"]  # 8in x 8in
+
+        large_image = temp_dir / "large.png"
+        Image.new("RGB", (4000, 4000), color="blue").save(large_image)
+        small_image = temp_dir / "small.png"
+        Image.new("RGB", (800, 800), color="blue").save(small_image)
+
+        source, size = service._get_page_source(large_image, page_width, page_height)
+        assert size == (8 * PRINT_DPI, 8 * PRINT_DPI)
+        assert not isinstance(source, str)
+
+        source, size = service._get_page_source(small_image, page_width, page_height)
+        assert source == str(small_image)
+        assert size == (800, 800)
+
+        source, size = service._get_page_source(
+            small_image, page_width, page_height, dpi=50
+        )
+        assert size == (400, 400)
+
+    def test_get_page_source_keeps_downsampled_jpegs_as_jpeg(self, temp_dir: Path):
+        """Test that oversized JPEG pages are re-encoded as JPEG."""
+        service = PdfService()
+        page_width, page_height = ASPECT_RATIO_SIZES["1:1"]  # 8in x 8in
+
+        photo = temp_dir / "photo.jpg"
+        Image.new("RGB", (4000, 4000), color="blue").save(photo, "JPEG")
+
+        source, size = service._get_page_source(photo, page_width, page_height)
+
+        assert size == (8 * PRINT_DPI, 8 * PRINT_DPI)
+        assert source.jpeg_fh() is not None
@@ -387,3 +387,14 @@ class TestSystemPromptOverrides:
 
         with pytest.raises(ValueError, match="Invalid aspect ratio"):
             settings.character_sheet_aspect_ratio = "invalid"
+
+    def test_max_concurrent_generations(self, config_path: Path):
+        """Test concurrent generation limit default, persistence and validation."""
+        settings = Settings(config_path)
+        assert settings.max_concurrent_generations == 4
+
+        settings.max_concurrent_generations = 2
+        assert Settings(config_path).max_concurrent_generations == 2
+
+        with pytest.raises(ValueError, match="between 1 and 8"):
+            settings.max_concurrent_generations = 0
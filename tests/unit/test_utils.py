@@ -0,0 +1,121 @@
+"""Unit tests for shared UI helpers in src._utils."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src import _utils
+from src.services.settings import Settings
+
+
+@pytest.fixture
+def app_state(working_folder: Path, config_path: Path, mock_keyring):
+    """Point the global APP at a real Settings instance for the working folder."""
+    settings = Settings(config_path)
+    settings._config["working_folder"] = str(working_folder)
+    with (
+        patch.object(_utils.APP, "settings", settings),
+        patch.object(_utils.APP, "image_service", None),
+        patch.object(_utils.APP, "thumbnail_index", set()),
+    ):
+        yield _utils.APP
+
+
+@pytest.mark.unit
+class TestThumbnailIndex:
+    def test_refresh_thumbnail_index_scans_folder(self, app_state, working_folder):
+        (working_folder / ".thumbnails" / "a_thumb.webp").touch()
+        (working_folder / ".thumbnails" / "b_thumb.webp").touch()
+
+        _utils.refresh_thumbnail_index()
+
+        assert app_state.thumbnail_index == {"a_thumb.webp", "b_thumb.webp"}
+
+    def test_display_path_uses_index(self, app_state, working_folder):
+        image = working_folder / "pages" / "a.png"
+        app_state.thumbnail_index = {"a_thumb.webp"}
+
+        # The image itself does not exist; the indexed thumbnail is returned
+        # without touching the filesystem.
+        assert _utils.get_display_path(image) == (
+            working_folder / ".thumbnails" / "a_thumb.webp"
+        )
+
+    def test_display_path_creates_missing_thumbnail(self, app_state, working_folder):
+        image = working_folder / "pages" / "a.png"
+        thumb = working_folder / ".thumbnails" / "a_thumb.webp"
+        app_state.image_service = MagicMock()
+        app_state.image_service.ensure_thumbnail.return_value = thumb
+
+        assert _utils.get_display_path(image) == thumb
+        assert "a_thumb.webp" in app_state.thumbnail_index
+
+    @pytest.mark.asyncio
+    async def test_prepared_thumbnails_are_swapped_in(self, app_state, working_folder):
+        image = working_folder / "pages" / "a.png"
+        image.touch()
+        thumb = working_folder / ".thumbnails" / "a_thumb.webp"
+        app_state.image_service = MagicMock()
+        app_state.image_service.ensure_thumbnails = AsyncMock(
+            return_value={image: thumb}
+        )
+        placeholder = MagicMock()
+
+        with (
+            patch.object(_utils, "_thumbnail_waiters", {}),
+            patch.object(_utils.background_tasks, "create") as create,
+        ):
+            _utils.prepare_thumbnails([image])
+            # The card is built before the thumbnail exists
+            assert _utils.get_display_path(image) == image
+            app_state.image_service.ensure_thumbnail.assert_not_called()
+            _utils._thumbnail_waiters[image].append(placeholder)
+
+            await create.call_args.args[0]
+
+        placeholder.set_source.assert_called_once_with(str(thumb))
+        assert "a_thumb.webp" in app_state.thumbnail_index
+
+    def test_display_path_falls_back_to_image(self, app_state, working_folder):
+        image = working_folder / "pages" / "a.png"
+        assert _utils.get_display_path(image) is None
+
+        image.touch()
+        assert _utils.get_display_path(image) == image
+
+
+@pytest.mark.unit
+class TestDebounce:
+    @pytest.mark.asyncio
+    async def test_burst_runs_callback_once(self):
+        callback = MagicMock()
+        debounced = _utils.debounce(callback, delay=0.05)
+
+        for _ in range(5):
+            debounced()
+        callback.assert_not_called()
+
+        await asyncio.sleep(0.1)
+        callback.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_are_caught_and_logged(self, caplog):
+        callback = MagicMock(side_effect=ValueError("Top-P out of range"))
+        debounced = _utils.debounce(callback, delay=0.01)
+
+        debounced()
+        await asyncio.sleep(0.05)
+
+        callback.assert_called_once_with()
+        assert "Top-P out of range" in caplog.text
+
+
+@pytest.mark.unit
+class TestTooltipHtml:
+    def test_renders_line_breaks_and_indentation(self):
+        html = _utils.tooltip_html_from_text("model\n  <tokens>")
+
+        assert html == "model<br>&nbsp;&nbsp;&lt;tokens&gt;"
+        assert _utils.tooltip_html_from_text("model\n  <tokens>") is html